@@ -0,0 +1,189 @@
+# BENCHMARK SUITE FOR THE ISLAND FINDER
+#
+# Generates seeded synthetic land files, times every engine of land.py on them and
+# records the peak Python memory of each run with tracemalloc. Results are written
+# as JSON so that runs on different commits can be compared.
+#
+#   python benchmark.py --sizes 100 1000 --output bench_results.json
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import land
+
+
+# GRID GENERATORS
+# Each generator yields the rows of a rows x cols grid as '0'/'1' strings.
+# Only the random grid is seeded, the other grids are deterministic.
+
+def random_grid(rows, cols, density=0.5, seed=0):
+    rng = random.Random(seed)
+    for _ in range(rows):
+        yield ''.join('1' if rng.random() < density else '0' for _ in range(cols))
+
+
+def snake_grid(rows, cols):
+    # A single island winding through the whole grid: full rows joined at alternating ends.
+    for r in range(rows):
+        if r % 2 == 0:
+            yield '1' * cols
+        elif r % 4 == 1:
+            yield '0' * (cols - 1) + '1'
+        else:
+            yield '1' + '0' * (cols - 1)
+
+
+def column_snake_grid(rows, cols):
+    # The snake turned on its side: full columns joined at alternating ends. Apart from
+    # the first and last row every run is a single cell, and the island winds back and
+    # forth across every row, the worst case for run- and propagation-based labeling.
+    middle = ('10' * (cols // 2 + 1))[:cols]
+    for r in range(rows):
+        if r == 0:
+            yield ''.join('1' if c % 4 != 1 else '0' for c in range(cols))
+        elif r == rows - 1:
+            yield ''.join('1' if c % 4 != 3 else '0' for c in range(cols))
+        else:
+            yield middle
+
+
+def checkerboard_grid(rows, cols):
+    # Every island cell is its own island, the largest possible island count.
+    even = ('10' * (cols // 2 + 1))[:cols]
+    odd = ('01' * (cols // 2 + 1))[:cols]
+    for r in range(rows):
+        yield even if r % 2 == 0 else odd
+
+
+def all_land_grid(rows, cols):
+    for _ in range(rows):
+        yield '1' * cols
+
+
+GENERATORS = {
+    'random': random_grid,
+    'snake': snake_grid,
+    'column_snake': column_snake_grid,
+    'checkerboard': checkerboard_grid,
+    'all_land': all_land_grid,
+}
+SEEDED_GRIDS = {'random'}
+
+
+def write_grid(path, rows_iter):
+    with open(path, 'w') as output_file:
+        for row in rows_iter:
+            output_file.write(row)
+            output_file.write('\n')
+
+
+# ENGINES
+# Each engine takes the paths of the text and packed land files and returns the max area.
+
+def run_find_island(text_path, packed_path):
+    return land.IslandFinder(text_path).find_island()
+
+
+def run_label_islands(text_path, packed_path):
+    return land.IslandFinder(text_path).label_islands()[0]
+
+
+def run_numpy(text_path, packed_path):
+    return land.IslandFinder(text_path, backend='numpy').label_islands()[0]
+
+
+def run_packed(text_path, packed_path):
+    with land.IslandFinder(packed_path, backend='packed') as finder:
+        return finder.label_islands()[0]
+
+
+def run_streaming(text_path, packed_path):
+    return land.StreamingIslandFinder(text_path).find_island()
+
+
+def run_parallel(text_path, packed_path):
+    # Only the parent process is seen by tracemalloc.
+    return land.IslandFinder(text_path).find_island_parallel()
+
+
+ENGINES = {
+    'find_island': run_find_island,
+    'label_islands': run_label_islands,
+    'numpy': run_numpy,
+    'packed': run_packed,
+    'streaming': run_streaming,
+    'parallel': run_parallel,
+}
+
+# find_island is quadratic in the number of land cells, larger grids are skipped for it.
+LEGACY_MAX_CELLS = 100 * 100
+
+
+def measure(engine, text_path, packed_path, memory):
+    start = time.perf_counter()
+    max_area = engine(text_path, packed_path)
+    result = {'max_area': int(max_area), 'seconds': time.perf_counter() - start}
+    if memory:
+        tracemalloc.start()
+        try:
+            engine(text_path, packed_path)
+            result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(sizes, grids, engines, seed=0, memory=True, legacy_max_cells=LEGACY_MAX_CELLS):
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            for grid in grids:
+                text_path = os.path.join(workdir, f'{grid}_{size}.txt')
+                packed_path = os.path.join(workdir, f'{grid}_{size}.land')
+                if grid in SEEDED_GRIDS:
+                    write_grid(text_path, GENERATORS[grid](size, size, seed=seed))
+                else:
+                    write_grid(text_path, GENERATORS[grid](size, size))
+                land.convert_text_to_binary(text_path, packed_path)
+                for name in engines:
+                    if name == 'numpy' and land.np is None:
+                        continue
+                    if name == 'find_island' and size * size > legacy_max_cells:
+                        continue
+                    record = {'grid': grid, 'rows': size, 'cols': size, 'engine': name}
+                    if grid in SEEDED_GRIDS:
+                        record['seed'] = seed
+                    record.update(measure(ENGINES[name], text_path, packed_path, memory))
+                    results.append(record)
+                    print(f"{grid:>12} {size:>6} {name:>14} {record['seconds']:10.4f}s"
+                          f"  max_area={record['max_area']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the island finder engines.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 300, 1000],
+                        help='side lengths of the square grids (up to 10000)')
+    parser.add_argument('--grids', nargs='+', default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--legacy-max-cells', type=int, default=LEGACY_MAX_CELLS,
+                        help='largest grid (in cells) find_island is run on')
+    parser.add_argument('--output', default='bench_results.json')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.grids, args.engines, args.seed,
+                             not args.no_memory, args.legacy_max_cells)
+    with open(args.output, 'w') as output_file:
+        json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}, output_file, indent=2)
+    print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,47 @@
+from array import array
+import mmap
+import multiprocessing
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError:     # NumPy is optional, only the 'numpy' backend needs it.
+    np = None
+
 # FINDING ISLAND CLASS
 
 class IslandFinder:
-    def __init__(self, path):       # Initializing land, cellstack, explored list, and _MaxArea.
-        self._land = self.text_to_array(path)
+    def __init__(self, path, backend='python'):       # Initializing land, cellstack, explored list, and _MaxArea.
+        # backend 'python' keeps _land as a list of lists, 'numpy' loads it as a uint8 array
+        # and 'packed' memory-maps a bit-packed land file (see convert_text_to_binary).
+        if backend not in ('python', 'numpy', 'packed'):
+            raise ValueError("backend has to be 'python', 'numpy' or 'packed'.")
+        if backend == 'numpy' and np is None:
+            raise ImportError("The 'numpy' backend requires NumPy.")
+        self._backend = backend
+        self._path = path
+        if backend == 'python':
+            self._land = self.text_to_array(path)
+        elif backend == 'numpy':
+            self._land = load_land_array(path)
+        else:
+            self._land = PackedLand(path)
         self._cellstack = []
         self._explored = []
         self._maxArea = 0
 
+    def close(self):
+        # Releasing the memory map of the packed backend, the other backends hold no open resources.
+        if self._backend == 'packed':
+            self._land.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def text_to_array(self, path):
         with open(path, 'r') as input_file:           # Reading input_file and returning it as an list.
             return [list(line.strip()) for line in input_file]
@@ -32,6 +67,9 @@ class IslandFinder:
         return neighbors[0] if neighbors else None
 
     def find_island(self):  # Finding Island function
+        if self._backend != 'python':   # Only the list of lists can be walked cell by cell here.
+            self._maxArea = self.label_islands()[0]
+            return self._maxArea
         # Clearing and initializing _cellstack and _explored.
         self._cellstack = []
         self._explored = []
@@ -64,7 +102,675 @@ class IslandFinder:
                     self._maxArea = max(self._maxArea, _area)
         # Return _maxArea, which represents the maximum area of an island in the grid
         return self._maxArea
-    
+
+    def shape(self):
+        # Returning (rows, cols) of the land for every backend.
+        if self._backend != 'python':
+            return self._land.shape
+        return len(self._land), (len(self._land[0]) if self._land else 0)
+
+    def flat_land(self):
+        # Packing _land into one bytearray indexed by row*width+col, 1 for island and 0 for water.
+        # The numpy backend is already flat-indexable and is returned as a view. The packed
+        # backend is decoded row by row, reading its bits per cell in Python would be far slower.
+        if self._backend == 'numpy':
+            return self._land.ravel()
+        if self._backend == 'packed':
+            return self._land.unpack()
+        cols = len(self._land[0]) if self._land else 0
+        if any(len(row) != cols for row in self._land):
+            raise InvalidLandException("Invalid land structure: Every row has to be of the same length.")
+        return bytearray(cell == '1' for row in self._land for cell in row)
+
+    def label_islands(self):
+        # Labeling every island of the grid in a single O(rows*cols) pass.
+        # Returns (max area, area of every island, per-cell label map), see label_cells.
+        if self._backend == 'numpy':
+            return label_grid_numpy(self._land)
+        return label_cells(self.flat_land(), *self.shape())
+
+    def island_stats(self):
+        # Per-island area, perimeter, bounding box, centroid and hole count from one traversal.
+        # Returns parallel arrays keyed by island number - 1, see island_stats below.
+        return island_stats(self.flat_land(), *self.shape())
+
+    def find_island_parallel(self, workers=None, min_rows_per_tile=64):
+        # Splitting the land file into horizontal tiles that are labeled in separate processes.
+        # Workers read their own rows from an mmap of the file, so the grid is not copied to them.
+        # Labels touching across a tile edge are then joined and their areas combined.
+        layout = _land_file_layout(self._path) if self._backend != 'packed' else None
+        workers = workers or os.cpu_count() or 1
+        tiles = min(workers, layout[0] // min_rows_per_tile) if layout else 1
+        if tiles <= 1:              # Small or irregular files are labeled in this process.
+            self._maxArea = self.label_islands()[0]
+            return self._maxArea
+        rows, cols, stride = layout
+        bounds = [rows * t // tiles for t in range(tiles + 1)]
+        jobs = [(self._path, stride, cols, bounds[t], bounds[t + 1]) for t in range(tiles)]
+        with multiprocessing.Pool(tiles) as pool:
+            results = pool.starmap(_label_tile, jobs)
+
+        # Tile t's label k becomes the global label offsets[t] + k - 1.
+        offsets = [0]
+        for areas, _, _ in results:
+            offsets.append(offsets[-1] + len(areas))
+        parent = list(range(offsets[-1]))
+        for t in range(tiles - 1):
+            bottom, top = results[t][2], results[t + 1][1]
+            for column in range(cols):
+                if bottom[column] and top[column]:
+                    upper = find_root(parent, offsets[t] + bottom[column] - 1)
+                    lower = find_root(parent, offsets[t + 1] + top[column] - 1)
+                    if upper != lower:
+                        parent[lower] = upper
+        island_areas = {}
+        for t, (areas, _, _) in enumerate(results):
+            for k, area in enumerate(areas):
+                root = find_root(parent, offsets[t] + k)
+                island_areas[root] = island_areas.get(root, 0) + area
+        self._maxArea = max(island_areas.values(), default=0)
+        return self._maxArea
+
+    def build_index(self):
+        # Returning an IslandIndex of this grid for repeated region queries.
+        return IslandIndex(self)
+
+    def dynamic(self):
+        # Returning a DynamicIslandFinder seeded with this grid, for incremental updates.
+        return DynamicIslandFinder(*self.shape(), self.flat_land())
+
+
+def label_cells(cells, rows, cols, stack=None):
+    """Label the 4-connected islands of a flat row-major grid in O(rows*cols).
+
+    cells[row*cols + col] is truthy for island cells. Return (max_area, areas, labels)
+    where labels[i] is 0 for water or the island number k >= 1 of cell i, and
+    areas[k - 1] is the area of island k. Islands are numbered in the row-major
+    order of their first cell. stack holds the flood fill's cell indices and may be
+    any stack with push/pop/__len__ (a new CompactStack by default).
+    """
+    size = rows * cols
+    labels = array('i', [0]) * size     # doubles as the visited set
+    areas = []
+    if stack is None:
+        stack = CompactStack()
+    push, pop = stack.push, stack.pop
+    label = 0
+    for start in range(size):
+        if not cells[start] or labels[start]:
+            continue
+        label += 1
+        labels[start] = label           # cells are marked when pushed, so each one is pushed once
+        push(start)
+        area = 0
+        while stack:
+            i = pop()
+            area += 1
+            col = i % cols
+            # Pushing every unlabeled island neighbor (upper, right, lower, left).
+            if i >= cols and cells[i - cols] and not labels[i - cols]:
+                labels[i - cols] = label
+                push(i - cols)
+            if col < cols - 1 and cells[i + 1] and not labels[i + 1]:
+                labels[i + 1] = label
+                push(i + 1)
+            if i + cols < size and cells[i + cols] and not labels[i + cols]:
+                labels[i + cols] = label
+                push(i + cols)
+            if col > 0 and cells[i - 1] and not labels[i - 1]:
+                labels[i - 1] = label
+                push(i - 1)
+        areas.append(area)
+    return (max(areas) if areas else 0), areas, labels
+
+
+# Byte translation table mapping '1' to 1 and every other byte to 0.
+_LAND_BYTES = bytes(int(byte == ord('1')) for byte in range(256))
+
+
+def _land_file_layout(path):
+    # Returning (rows, cols, stride) when every row of the land file has the same length
+    # and line ending, so row r starts at byte r*stride. Returns None otherwise.
+    with open(path, 'rb') as input_file:
+        first = input_file.readline()
+        size = os.fstat(input_file.fileno()).st_size
+    cols = len(first.rstrip(b'\r\n'))
+    stride = len(first)
+    if cols == 0 or stride == cols:
+        return None
+    if size % stride == 0:
+        return size // stride, cols, stride
+    if size % stride == cols:       # last row without a line ending
+        return size // stride + 1, cols, stride
+    return None
+
+
+def _label_tile(path, stride, cols, first_row, last_row):
+    # Worker of find_island_parallel: labels rows [first_row, last_row) of the land file.
+    # Returns the tile's island areas and the labels of its first and last rows.
+    with open(path, 'rb') as input_file:
+        with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            ending = mapped[cols:stride]     # line ending of the first row
+            tile = mapped[first_row * stride:last_row * stride]
+    # Every row has to end exactly at column cols, only the last row of the file may lack its ending.
+    rows = last_row - first_row
+    for r in range(rows):
+        row_ending = tile[r * stride + cols:(r + 1) * stride]
+        if row_ending != ending and not (row_ending == b'' and r == rows - 1):
+            raise InvalidLandException("Invalid land structure: Every row has to be of the same length.")
+    cells = tile.translate(_LAND_BYTES, b'\r\n')
+    if len(cells) != rows * cols:
+        raise InvalidLandException("Invalid land structure: Every row has to be of the same length.")
+    _, areas, labels = label_cells(cells, rows, cols)
+    return areas, labels[:cols], labels[-cols:]
+
+
+# Columns returned by island_stats, 'centroid_*' hold floats and the rest integers.
+STAT_COLUMNS = ('area', 'perimeter', 'min_row', 'min_col', 'max_row', 'max_col',
+                'centroid_row', 'centroid_col', 'holes')
+
+
+def island_stats(cells, rows, cols, stack=None):
+    """Collect shape statistics of every 4-connected island in a single flood fill.
+
+    Return a dict mapping each name of STAT_COLUMNS to an array whose entry k - 1
+    belongs to island k (numbered as in label_cells). Holes are the enclosed water
+    regions (8-connected, as water is seen by 4-connected land), counted from the
+    island's Euler number: cells - adjacent pairs + full 2x2 blocks = 1 - holes.
+    """
+    size = rows * cols
+    columns = {name: array('d' if name.startswith('centroid') else 'q') for name in STAT_COLUMNS}
+    visited = bytearray(size)
+    if stack is None:
+        stack = CompactStack()
+    push, pop = stack.push, stack.pop
+    for start in range(size):
+        if not cells[start] or visited[start]:
+            continue
+        visited[start] = 1
+        push(start)
+        area = perimeter = pairs = blocks = row_sum = col_sum = 0
+        min_row, min_col, max_row, max_col = rows, cols, -1, -1
+        while stack:
+            i = pop()
+            row, col = divmod(i, cols)
+            area += 1
+            row_sum += row
+            col_sum += col
+            min_row, max_row = min(min_row, row), max(max_row, row)
+            min_col, max_col = min(min_col, col), max(max_col, col)
+            up = i >= cols and cells[i - cols]
+            right = col < cols - 1 and cells[i + 1]
+            down = i + cols < size and cells[i + cols]
+            left = col > 0 and cells[i - 1]
+            perimeter += 4 - bool(up) - bool(right) - bool(down) - bool(left)
+            # Pairs and 2x2 blocks are counted once, from their upper-left cell.
+            pairs += bool(right) + bool(down)
+            if right and down and cells[i + cols + 1]:
+                blocks += 1
+            for neighbor, is_land in ((i - cols, up), (i + 1, right), (i + cols, down), (i - 1, left)):
+                if is_land and not visited[neighbor]:
+                    visited[neighbor] = 1
+                    push(neighbor)
+        columns['area'].append(area)
+        columns['perimeter'].append(perimeter)
+        columns['min_row'].append(min_row)
+        columns['min_col'].append(min_col)
+        columns['max_row'].append(max_row)
+        columns['max_col'].append(max_col)
+        columns['centroid_row'].append(row_sum / area)
+        columns['centroid_col'].append(col_sum / area)
+        columns['holes'].append(1 - (area - pairs + blocks))
+    return columns
+
+
+def load_land_array(path):
+    """Read a '0'/'1' land file into a rows x cols uint8 NumPy array of 0s and 1s."""
+    with open(path, 'rb') as input_file:
+        lines = input_file.read().split()
+    if len(set(map(len, lines))) > 1:
+        raise InvalidLandException("Invalid land structure: Every row has to be of the same length.")
+    cols = len(lines[0]) if lines else 0
+    cells = np.frombuffer(b''.join(lines), dtype=np.uint8).reshape(len(lines), cols)
+    return (cells == ord('1')).view(np.uint8)
+
+
+def label_grid_numpy(grid):
+    """Vectorized counterpart of label_cells for a 2D NumPy grid (nonzero is island).
+
+    The grid is split into horizontal runs of island cells, runs touching in
+    adjacent rows are joined by min-label propagation with pointer jumping, and
+    the run labels are expanded back to cells. Return values match label_cells:
+    (max_area, areas, labels) with labels flat and in the same numbering.
+    """
+    rows, cols = grid.shape
+    land = grid != 0
+    labels = np.zeros(rows * cols, dtype=np.int32)
+    # Run boundaries: +1 where a run starts, -1 one past where it ends.
+    padded = np.zeros((rows, cols + 2), dtype=np.int8)
+    padded[:, 1:-1] = land
+    steps = np.diff(padded, axis=1)
+    run_row, run_start = np.nonzero(steps == 1)
+    run_end = np.nonzero(steps == -1)[1]
+    runs = len(run_row)
+    if runs == 0:
+        return 0, np.zeros(0, dtype=np.int64), labels
+
+    # Runs of the row above overlapping each run form a contiguous block, found with
+    # searchsorted on positions spaced cols + 1 apart so rows never touch.
+    width = cols + 1
+    above = (run_row - 1) * width
+    low = np.searchsorted(run_row * width + run_end, above + run_start, side='right')
+    high = np.searchsorted(run_row * width + run_start, above + run_end, side='left')
+    counts = np.maximum(high - low, 0)
+    lower = np.repeat(np.arange(runs), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    upper = np.repeat(low, counts) + offsets
+
+    # Every run ends up pointing at the first run (in row-major order) of its island.
+    # Each round hooks the larger root of every edge whose ends disagree onto the
+    # smaller one, then pointer-jumps until every run points at its root.
+    comp = np.arange(runs)
+    while True:
+        lower_root, upper_root = comp[lower], comp[upper]
+        apart = lower_root != upper_root
+        if not apart.any():
+            break
+        np.minimum.at(comp, np.maximum(lower_root, upper_root)[apart], np.minimum(lower_root, upper_root)[apart])
+        while True:
+            jumped = comp[comp]
+            if np.array_equal(jumped, comp):
+                break
+            comp = jumped
+
+    island = np.unique(comp, return_inverse=True)[1]
+    areas = np.bincount(island, weights=run_end - run_start).astype(np.int64)
+    labels[land.ravel()] = np.repeat(island + 1, run_end - run_start)
+    return int(areas.max()), areas, labels
+
+def find_root(parent, label):
+    """Return the union-find root of label, compressing the path on the way.
+
+    parent maps each label to its parent label (a list or a dict), roots map to themselves.
+    """
+    root = label
+    while parent[root] != root:
+        root = parent[root]
+    while parent[label] != root:
+        parent[label], label = root, parent[label]
+    return root
+
+# PACKED LAND CLASS
+
+# Binary land format: a header with a magic tag, rows and cols, followed by the rows,
+# each packed 8 cells per byte (most significant bit first) and padded to whole bytes.
+_PACKED_HEADER = struct.Struct('<4sQQ')
+_PACKED_MAGIC = b'LAND'
+
+
+def convert_text_to_binary(text_path, binary_path):
+    """Convert a '0'/'1' land file into the bit-packed format, one row at a time."""
+    rows = cols = stride = 0
+    with open(text_path, 'r') as input_file, open(binary_path, 'wb') as output_file:
+        output_file.write(_PACKED_HEADER.pack(_PACKED_MAGIC, 0, 0))     # rewritten at the end
+        for line in input_file:
+            line = line.strip()
+            if not line:
+                continue
+            if rows == 0:
+                cols = len(line)
+                stride = (cols + 7) // 8
+            elif len(line) != cols:
+                raise InvalidLandException("Invalid land structure: Every row has to be of the same length.")
+            if line.count('0') + line.count('1') != cols:
+                raise InvalidLandException("Invalid land structure: Each cell has to be a single character '0'(water) or '1'(island)).")
+            output_file.write(int(line + '0' * (stride * 8 - cols), 2).to_bytes(stride, 'big'))
+            rows += 1
+        output_file.seek(0)
+        output_file.write(_PACKED_HEADER.pack(_PACKED_MAGIC, rows, cols))
+
+
+class PackedLand:
+    """Read-only, memory-mapped view of a bit-packed land file.
+
+    Single cells are read straight from the mapped bits: land[row*cols + col] is 1
+    for island and 0 for water. Whole-grid passes should use unpack(), which decodes
+    one row per call into a byte-per-cell bytearray (8x the packed size, but without
+    a Python call for every cell).
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as input_file:
+            self._mapped = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mapped) < _PACKED_HEADER.size:
+            raise InvalidLandException("Invalid land file: missing header.")
+        magic, self.rows, self.cols = _PACKED_HEADER.unpack_from(self._mapped)
+        self._stride = (self.cols + 7) // 8
+        if magic != _PACKED_MAGIC or len(self._mapped) != _PACKED_HEADER.size + self.rows * self._stride:
+            raise InvalidLandException("Invalid land file: not a packed land file or truncated.")
+
+    @property
+    def shape(self):
+        return self.rows, self.cols
+
+    def __len__(self):
+        return self.rows * self.cols
+
+    def __getitem__(self, index):
+        row, column = divmod(index, self.cols)
+        byte = self._mapped[_PACKED_HEADER.size + row * self._stride + (column >> 3)]
+        return (byte >> (7 - (column & 7))) & 1
+
+    def row(self, r):
+        """Return row r as a bytes object of 0s and 1s."""
+        start = _PACKED_HEADER.size + r * self._stride
+        bits = int.from_bytes(self._mapped[start:start + self._stride], 'big')
+        return format(bits, f'0{self._stride * 8}b')[:self.cols].encode().translate(_LAND_BYTES)
+
+    def unpack(self):
+        """Return the whole grid as a flat bytearray of 0s and 1s, indexed by row*cols + col."""
+        return bytearray().join(self.row(r) for r in range(self.rows))
+
+    def close(self):
+        self._mapped.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# STREAMING ISLAND FINDER CLASS
+
+class StreamingIslandFinder:
+    # Hoshen-Kopelman labeling that reads the land file one line at a time.
+    # Only the labels of the previous row and a union-find of the provisional labels
+    # still touching that row are kept, so memory is O(width + live islands).
+    def __init__(self, path):       # The land file is not loaded here, it is streamed by find_island.
+        self._path = path
+        self._maxArea = 0
+        self._islandCount = 0
+
+    def find_island(self):
+        self._maxArea = 0
+        self._islandCount = 0
+        parent = {}         # provisional label -> parent label
+        area = {}           # root label -> area counted so far
+        previous = None     # root labels of the previous row, 0 for water
+        next_label = 1
+        with open(self._path, 'r') as input_file:
+            for line in input_file:
+                line = line.strip()
+                if not line:
+                    continue
+                if previous is None:
+                    previous = [0] * len(line)
+                elif len(line) != len(previous):
+                    raise InvalidLandException("Invalid land structure: Every row has to be of the same length.")
+                current = [0] * len(line)
+                for column, cell in enumerate(line):
+                    if cell != '1':
+                        continue
+                    left = current[column - 1] if column > 0 else 0
+                    up = previous[column]
+                    if left and up:
+                        # Both neighbors are island, joining their provisional labels (union by area).
+                        left, up = find_root(parent, left), find_root(parent, up)
+                        if left != up:
+                            if area[left] < area[up]:
+                                left, up = up, left
+                            parent[up] = left
+                            area[left] += area.pop(up)
+                        label = left
+                    elif left or up:
+                        label = find_root(parent, left or up)
+                    else:
+                        label = next_label
+                        next_label += 1
+                        parent[label] = label
+                        area[label] = 0
+                    area[label] += 1
+                    current[column] = label
+                # Resolving the row to roots and closing the islands that did not reach it.
+                current = [find_root(parent, label) if label else 0 for label in current]
+                alive = set(current)
+                for root in area:
+                    if root not in alive:
+                        self._close_island(area[root])
+                parent = {root: root for root in alive if root}
+                area = {root: area[root] for root in parent}
+                previous = current
+        for root in area:
+            self._close_island(area[root])
+        return self._maxArea
+
+    def _close_island(self, island_area):
+        self._islandCount += 1
+        self._maxArea = max(self._maxArea, island_area)
+
+    def island_count(self):
+        # Number of islands found by the last find_island call.
+        return self._islandCount
+
+# ISLAND INDEX CLASS
+
+class IslandIndex:
+    """Precomputed label map, per-island tables and land prefix sums of a fixed grid.
+
+    Rectangles are given by inclusive corners (r0, c0, r1, c1) and are clipped to
+    the grid. Islands are identified by their label k >= 1 from label_islands.
+    The grid is also cut into tile x tile squares, each listing the islands it
+    holds, so islands_in_rect only reads the label map along the rectangle border.
+    """
+
+    def __init__(self, finder, tile=32):
+        self.rows, self.cols = finder.shape()
+        rows, cols = self.rows, self.cols
+        _, areas, self._labels = finder.label_islands()
+        count = len(areas)
+        self._area = array('q', (int(area) for area in areas))
+        # Per-island tables, index k - 1 for island k.
+        self._min_row = array('q', [rows]) * count
+        self._min_col = array('q', [cols]) * count
+        self._max_row = array('q', [-1]) * count
+        self._max_col = array('q', [-1]) * count
+        self._row_sum = array('q', [0]) * count
+        self._col_sum = array('q', [0]) * count
+        # _prefix[(r+1)*(cols+1) + (c+1)] is the number of land cells in rows <= r and columns <= c.
+        self._prefix = array('q', [0]) * ((rows + 1) * (cols + 1))
+        prefix, labels = self._prefix, self._labels
+        for r in range(rows):
+            running = 0
+            above = r * (cols + 1)
+            here = above + cols + 1
+            for c in range(cols):
+                k = labels[r * cols + c]
+                if k:
+                    running += 1
+                    k -= 1
+                    self._min_row[k] = min(self._min_row[k], r)
+                    self._min_col[k] = min(self._min_col[k], c)
+                    self._max_row[k] = max(self._max_row[k], r)
+                    self._max_col[k] = max(self._max_col[k], c)
+                    self._row_sum[k] += r
+                    self._col_sum[k] += c
+                prefix[here + c + 1] = prefix[above + c + 1] + running
+        # _tile_labels[tr*_tiles_across + tc] is the sorted tuple of the islands in tile (tr, tc).
+        self._tile = tile
+        self._tiles_across = (cols + tile - 1) // tile
+        self._tile_labels = []
+        for top in range(0, rows, tile):
+            members = [set() for _ in range(self._tiles_across)]
+            for r in range(top, min(top + tile, rows)):
+                for tc, left in enumerate(range(0, cols, tile)):
+                    members[tc].update(labels[r * cols + left:r * cols + min(left + tile, cols)])
+            for found in members:
+                found.discard(0)
+                self._tile_labels.append(tuple(sorted(found)))
+
+    def __len__(self):
+        """Return the number of islands."""
+        return len(self._area)
+
+    def _clip(self, r0, c0, r1, c1):
+        return max(r0, 0), max(c0, 0), min(r1, self.rows - 1), min(c1, self.cols - 1)
+
+    def island_at(self, r, c):
+        """Return the label of the island covering (r, c), or 0 for water."""
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            raise IndexError(f"Cell ({r}, {c}) is out of the land.")
+        return int(self._labels[r * self.cols + c])
+
+    def _island(self, k):
+        # Returning the table index of island k, labels run from 1 to len(self).
+        if not 1 <= k <= len(self):
+            raise IndexError(f"No island with label {k}.")
+        return k - 1
+
+    def area(self, k):
+        """Return the area of island k. Raise IndexError unless 1 <= k <= len(self)."""
+        return self._area[self._island(k)]
+
+    def bbox(self, k):
+        """Return the bounding box (r0, c0, r1, c1) of island k."""
+        k = self._island(k)
+        return self._min_row[k], self._min_col[k], self._max_row[k], self._max_col[k]
+
+    def centroid(self, k):
+        """Return the (row, col) centroid of island k."""
+        k = self._island(k)
+        return self._row_sum[k] / self._area[k], self._col_sum[k] / self._area[k]
+
+    def land_in_rect(self, r0, c0, r1, c1):
+        """Return the number of land cells in the rectangle in O(1)."""
+        r0, c0, r1, c1 = self._clip(r0, c0, r1, c1)
+        if r0 > r1 or c0 > c1:
+            return 0
+        width, prefix = self.cols + 1, self._prefix
+        return (prefix[(r1 + 1) * width + c1 + 1] - prefix[r0 * width + c1 + 1]
+                - prefix[(r1 + 1) * width + c0] + prefix[r0 * width + c0])
+
+    def islands_in_rect(self, r0, c0, r1, c1):
+        """Return the sorted labels of the islands having at least one cell in the rectangle.
+
+        Tiles inside the rectangle contribute their island lists as is. Tiles cut
+        by its border are skipped when they hold no new island, decided in O(1)
+        with the prefix sums when they hold a single one, and only otherwise read
+        from the label map. The cost is O(tiles covered + islands listed by them +
+        cells of the cut tiles), independent of the islands outside the rectangle.
+        """
+        r0, c0, r1, c1 = self._clip(r0, c0, r1, c1)
+        if r0 > r1 or c0 > c1:
+            return []
+        tile, labels, cols = self._tile, self._labels, self.cols
+        found = set()
+        for tr in range(r0 // tile, r1 // tile + 1):
+            top, bottom = tr * tile, min(tr * tile + tile, self.rows) - 1
+            low, high = max(top, r0), min(bottom, r1)
+            for tc in range(c0 // tile, c1 // tile + 1):
+                members = self._tile_labels[tr * self._tiles_across + tc]
+                if not members or found.issuperset(members):
+                    continue
+                left, right = tc * tile, min(tc * tile + tile, cols) - 1
+                first, last = max(left, c0), min(right, c1)
+                if (low, first, high, last) == (top, left, bottom, right):     # tile fully covered
+                    found.update(members)
+                elif len(members) == 1:
+                    if self.land_in_rect(low, first, high, last):
+                        found.update(members)
+                else:
+                    for r in range(low, high + 1):
+                        found.update(labels[r * cols + first:r * cols + last + 1])
+        found.discard(0)
+        return sorted(int(k) for k in found)
+
+    def largest_island_in_rect(self, r0, c0, r1, c1):
+        """Return the label of the largest island touching the rectangle (or None)."""
+        return max(self.islands_in_rect(r0, c0, r1, c1), key=self.area, default=None)
+
+# DYNAMIC ISLAND FINDER CLASS
+
+class DynamicIslandFinder:
+    # Keeps the islands of a grid up to date while water cells turn into land.
+    # A union-find over flat cell indices (path compression plus union by size) makes
+    # add_land, current_max_area and island_count near-constant amortized.
+    # Removing land is not supported by union-find, so remove_land rebuilds it.
+    def __init__(self, rows, cols, cells=None):    # cells: optional flat row-major grid, truthy for island.
+        self._rows = rows
+        self._cols = cols
+        self._build(cells)
+
+    def _build(self, cells):
+        self._parent = array('i', range(self._rows * self._cols))
+        self._size = array('i', [0]) * (self._rows * self._cols)    # island area, kept on roots
+        self._land = bytearray(len(self._size))
+        self._islandCount = 0
+        self._maxArea = 0
+        if cells is not None:
+            for index, cell in enumerate(cells):
+                if cell:
+                    self._add(index)
+
+    def _index(self, r, c):
+        if not (0 <= r < self._rows and 0 <= c < self._cols):
+            raise IndexError(f"Cell ({r}, {c}) is out of the land.")
+        return r * self._cols + c
+
+    def _union(self, a, b):
+        a, b = find_root(self._parent, a), find_root(self._parent, b)
+        if a == b:
+            return
+        if self._size[a] < self._size[b]:     # smaller island goes under the larger one
+            a, b = b, a
+        self._parent[b] = a
+        self._size[a] += self._size[b]
+        self._islandCount -= 1
+        self._maxArea = max(self._maxArea, self._size[a])
+
+    def _add(self, index):
+        self._land[index] = 1
+        self._size[index] = 1
+        self._islandCount += 1
+        self._maxArea = max(self._maxArea, 1)
+        column = index % self._cols
+        # Joining the new cell with its island neighbors (upper, right, lower, left).
+        if index >= self._cols and self._land[index - self._cols]:
+            self._union(index, index - self._cols)
+        if column < self._cols - 1 and self._land[index + 1]:
+            self._union(index, index + 1)
+        if index + self._cols < len(self._land) and self._land[index + self._cols]:
+            self._union(index, index + self._cols)
+        if column > 0 and self._land[index - 1]:
+            self._union(index, index - 1)
+
+    def add_land(self, r, c):
+        # Turning water cell (r, c) into land. Adding an existing land cell does nothing.
+        index = self._index(r, c)
+        if not self._land[index]:
+            self._add(index)
+
+    def remove_land(self, r, c):
+        # Turning land cell (r, c) into water. This rebuilds the union-find in O(rows*cols).
+        index = self._index(r, c)
+        if self._land[index]:
+            cells = self._land
+            cells[index] = 0
+            self._build(cells)
+
+    def is_land(self, r, c):
+        return bool(self._land[self._index(r, c)])
+
+    def island_area(self, r, c):
+        # Area of the island containing (r, c), 0 for water.
+        index = self._index(r, c)
+        return self._size[find_root(self._parent, index)] if self._land[index] else 0
+
+    def current_max_area(self):
+        return self._maxArea
+
+    def island_count(self):
+        return self._islandCount
+
 # LAND CLASS
 
 class InvalidLandException(Exception):
@@ -130,4 +836,45 @@ class ArrayStack:
         """
         if self.is_empty():
             raise Empty('Stack is empty.')
-        return self._data.pop()         # remove last item from list
\ No newline at end of file
+        return self._data.pop()         # remove last item from list
+
+
+class CompactStack:
+    """LIFO Stack of integers (e.g. packed cell indices) stored in an array('q').
+
+    Every element takes 8 bytes instead of a list slot plus an int or tuple object.
+    """
+
+    def __init__(self):
+        """Create an empty stack."""
+        self._data = array('q')     # nonpublic array of 64-bit signed integers
+
+    def __len__(self):
+        """Return the number of elements in the stack."""
+        return len(self._data)
+
+    def is_empty(self):
+        """Return True if the stack is empty."""
+        return len(self._data) == 0
+
+    def push(self, e):
+        """Add integer e to the top of the stack."""
+        self._data.append(e)
+
+    def top(self):
+        """Return (but do not remove) the element at the top of the stack.
+
+        Raise Empty exception if the stack is empty."""
+        if self.is_empty():
+            raise Empty('Stack is empty.')
+        return self._data[-1]
+
+    def pop(self):
+        """Remove and return the element from the top of the stack (i.e., LIFO).
+
+        Raise Empty exception if the stack is empty.
+        """
+        try:
+            return self._data.pop()     # no is_empty call, pop runs once per flood-filled cell
+        except IndexError:
+            raise Empty('Stack is empty.') from None
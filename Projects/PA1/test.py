@@ -1,4 +1,78 @@
+import os
+import random
+import tempfile
+
 import land
 
 fi = land.IslandFinder('test.txt')
-print(fi.find_island())
\ No newline at end of file
+print(fi.find_island())
+print(fi.label_islands()[0])
+
+
+def check_numpy_parity(path):
+    # NumPy backend has to agree with the pure-Python engine.
+    max_area, areas, labels = land.IslandFinder(path).label_islands()
+    np_max_area, np_areas, np_labels = land.IslandFinder(path, backend='numpy').label_islands()
+    assert (max_area, list(areas), list(labels)) == (np_max_area, list(np_areas), list(np_labels)), path
+    return np_max_area
+
+
+def check_engine_parity(path, rng):
+    # Every other engine has to agree with label_islands on the same file.
+    max_area, areas, labels = land.IslandFinder(path).label_islands()
+    streaming = land.StreamingIslandFinder(path)
+    assert (streaming.find_island(), streaming.island_count()) == (max_area, len(areas)), path
+    # Several tiles are forced, so islands crossing tile edges have to be joined.
+    assert land.IslandFinder(path).find_island_parallel(workers=4, min_rows_per_tile=16) == max_area, path
+    packed_path = path + '.land'
+    land.convert_text_to_binary(path, packed_path)
+    with land.IslandFinder(packed_path, backend='packed') as packed:
+        packed_max_area, packed_areas, packed_labels = packed.label_islands()
+    assert (packed_max_area, list(packed_areas), list(packed_labels)) == (max_area, list(areas), list(labels)), path
+    # The dynamic finder is seeded with the grid, then random flips are checked against relabeling.
+    finder = land.IslandFinder(path)
+    dynamic = finder.dynamic()
+    assert (dynamic.current_max_area(), dynamic.island_count()) == (max_area, len(areas)), path
+    rows, cols = finder.shape()
+    cells = finder.flat_land()
+    for _ in range(10):
+        r, c = rng.randrange(rows), rng.randrange(cols)
+        if cells[r * cols + c]:
+            dynamic.remove_land(r, c)
+            cells[r * cols + c] = 0
+        else:
+            dynamic.add_land(r, c)
+            cells[r * cols + c] = 1
+        flip_max_area, flip_areas, _ = land.label_cells(cells, rows, cols)
+        assert (dynamic.current_max_area(), dynamic.island_count()) == (flip_max_area, len(flip_areas)), path
+
+
+if __name__ == '__main__':      # find_island_parallel workers may import this module again.
+    if land.np is not None:
+        print(check_numpy_parity('test.txt'))
+
+    # Grids whose runs only merge across many rows: a U-shape, a vertical serpentine
+    # (every other column, joined alternately at the top and bottom) and random grids,
+    # some of them tall enough to be split into several parallel tiles.
+    u_shape = ['1' + '0' * 18 + '1'] * 29 + ['1' * 20]
+    serpentine = [''.join('1' if c % 2 == 0 or (r == 0 and c % 4 == 1) or (r == 39 and c % 4 == 3) else '0'
+                          for c in range(41)) for r in range(40)]
+    rng = random.Random(310)
+    grids = [u_shape, serpentine]
+    for _ in range(20):
+        rows, cols = rng.randint(1, 30), rng.randint(1, 30)
+        grids.append([''.join(rng.choice('01') for _ in range(cols)) for _ in range(rows)])
+    for _ in range(6):
+        rows, cols, density = rng.randint(64, 120), rng.randint(1, 40), rng.uniform(0.4, 0.7)
+        grids.append([''.join('1' if rng.random() < density else '0' for _ in range(cols)) for _ in range(rows)])
+    with tempfile.TemporaryDirectory() as workdir:
+        for number, grid in enumerate(grids):
+            path = os.path.join(workdir, f'grid{number}.txt')
+            with open(path, 'w') as output_file:
+                output_file.write('\n'.join(grid) + '\n')
+            if land.np is not None:
+                check_numpy_parity(path)
+            check_engine_parity(path, rng)
+    if land.np is not None:
+        print('NumPy parity checked on', len(grids) + 1, 'grids')
+    print('Engine parity checked on', len(grids), 'grids')
@@ -0,0 +1,295 @@
+# BENCHMARK AND PROFILING SUITE FOR THE PA2 TREE PACKAGE
+#
+# Builds complete, balanced and degenerate (linked-list shaped) LinkedBinaryTrees
+# and measures every operation on them: time, peak Python memory (tracemalloc)
+# and the number of Position objects created. Each time is the median of --repeat
+# runs. Results are written as JSON and can be saved as a baseline that later runs
+# are compared against.
+#
+#   python benchmark.py --sizes 1000 100000 --save-baseline baseline.json
+#   python benchmark.py --sizes 1000 100000 --compare baseline.json
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+from tree import LinkedBinaryTree
+
+
+# TREE SHAPES
+
+def complete_tree(n):
+    tree = LinkedBinaryTree()
+    if n:
+        tree.fill(list(range(n)))
+    return tree
+
+
+def balanced_tree(n):
+    # Median split of range(n): height is minimal but the last level is not left-packed.
+    tree = LinkedBinaryTree()
+    if n == 0:
+        return tree
+    stack = [(tree._add_root(n // 2), 0, n // 2, n // 2 + 1, n)]
+    while stack:
+        p, low, middle, after, high = stack.pop()
+        if low < middle:
+            left = (low + middle) // 2
+            stack.append((tree._add_left(p, left), low, left, left + 1, middle))
+        if after < high:
+            right = (after + high) // 2
+            stack.append((tree._add_right(p, right), after, right, right + 1, high))
+    return tree
+
+
+def degenerate_tree(n):
+    tree = LinkedBinaryTree()
+    if n:
+        p = tree._add_root(0)
+        for e in range(1, n):
+            p = tree._add_right(p, e)
+    return tree
+
+
+SHAPES = {
+    'complete': complete_tree,
+    'balanced': balanced_tree,
+    'degenerate': degenerate_tree,
+}
+
+
+# OPERATIONS
+# Each operation has a setup(shape, n) building its arguments outside the measured
+# region and a run(*arguments) that is measured. Operations in MUTATING change their
+# arguments and get freshly set up ones for every timing run.
+
+def consume(iterator):
+    count = 0
+    for _ in iterator:
+        count += 1
+    return count
+
+
+def setup_tree(shape, n):
+    return (SHAPES[shape](n),)
+
+
+def setup_fill(shape, n):
+    return LinkedBinaryTree(), list(range(n))
+
+
+def setup_deepest(shape, n):
+    tree = SHAPES[shape](n)
+    deepest, depth = None, -1
+    stack = [(tree.root(), 0)]
+    while stack:
+        p, d = stack.pop()
+        if d > depth:
+            deepest, depth = p, d
+        stack.extend((c, d + 1) for c in tree.children(p))
+    return tree, deepest
+
+
+def setup_delete(shape, n, count=1000):
+    tree = SHAPES[shape](n)
+    leaves = [p for p in tree.iter_preorder(positions=True) if tree.is_leaf(p)][:count]
+    return tree, leaves
+
+
+def setup_attach(shape, n):
+    tree = SHAPES[shape](n)
+    leaf = next(p for p in tree.iter_preorder(positions=True) if tree.is_leaf(p))
+    return tree, leaf, SHAPES[shape](n // 2), SHAPES[shape](n // 2)
+
+
+def run_delete(tree, leaves):
+    for p in leaves:
+        tree._delete(p)
+
+
+OPERATIONS = {
+    'fill': (setup_fill, lambda tree, elements: tree.fill(elements)),
+    'levelorder': (setup_tree, lambda tree: tree.levelorder()),
+    'preorder': (setup_tree, lambda tree: consume(tree.preorder())),
+    'inorder': (setup_tree, lambda tree: consume(tree.inorder())),
+    'postorder': (setup_tree, lambda tree: consume(tree.postorder())),
+    'iter_preorder': (setup_tree, lambda tree: consume(tree.iter_preorder())),
+    'iter_inorder': (setup_tree, lambda tree: consume(tree.iter_inorder())),
+    'iter_postorder': (setup_tree, lambda tree: consume(tree.iter_postorder())),
+    'height': (setup_tree, lambda tree: tree.height()),
+    'depth': (setup_deepest, lambda tree, p: tree.depth(p)),
+    '_delete': (setup_delete, run_delete),
+    '_attach': (setup_attach, lambda tree, p, t1, t2: tree._attach(p, t1, t2)),
+}
+MUTATING = {'fill', '_delete', '_attach'}
+
+
+# MEASUREMENT
+
+class PositionCounter:
+    # Counts LinkedBinaryTree.Position constructions while active.
+    def __init__(self):
+        self.count = 0
+        self._original = LinkedBinaryTree.Position.__init__
+
+    def __enter__(self):
+        original = self._original
+
+        def counting_init(position, container, node):
+            self.count += 1
+            original(position, container, node)
+        LinkedBinaryTree.Position.__init__ = counting_init
+        return self
+
+    def __exit__(self, *exc_info):
+        LinkedBinaryTree.Position.__init__ = self._original
+
+
+def reference_workload():
+    # Fixed pure-Python work that does not use the tree, timed next to every operation
+    # as a yardstick of how fast the machine runs at that moment.
+    table = {}
+    for i in range(20000):
+        table[i] = [i, i + 1]
+    return sum(value[1] for value in table.values())
+
+
+def median_time(name, shape, n, repeat, min_time):
+    # Median of at least repeat timing runs of operation name, with freshly set up
+    # arguments for every run of a MUTATING one. Like timeit's autorange, fast operations
+    # are run until min_time seconds were measured, as they are the noisiest, or until
+    # 10 * min_time seconds have passed including the setups.
+    # The garbage collector is off while timing, as in timeit. On a busy machine the
+    # median moves far less between runs than the best time does.
+    # Returns the median times of the operation and of reference_workload, run before it.
+    setup, run = OPERATIONS[name]
+    arguments = setup(shape, n)
+    gc.collect()
+    times, references = [], []
+    deadline = time.perf_counter() + 10 * min_time
+    while len(times) < repeat or (sum(times) < min_time and time.perf_counter() < deadline):
+        if times and name in MUTATING:
+            arguments = setup(shape, n)
+            gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            reference_workload()
+            middle = time.perf_counter()
+            run(*arguments)
+            end = time.perf_counter()
+        finally:
+            gc.enable()
+        times.append(end - middle)
+        references.append(middle - start)
+    return statistics.median(times), statistics.median(references)
+
+
+def measure(name, shape, n, repeat=7, min_time=0.2):
+    # Median timing, then one more run under tracemalloc and the Position counter.
+    setup, run = OPERATIONS[name]
+    try:
+        seconds, reference = median_time(name, shape, n, repeat, min_time)
+    except RecursionError:
+        return {'error': 'RecursionError'}
+    result = {'seconds': seconds, 'reference_seconds': reference}
+    arguments = setup(shape, n)
+    with PositionCounter() as counter:
+        tracemalloc.start()
+        try:
+            run(*arguments)
+            result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    result['positions'] = counter.count
+    return result
+
+
+def run_benchmarks(sizes, shapes, operations, repeat=7, min_time=0.2):
+    results = []
+    for n in sizes:
+        for shape in shapes:
+            for name in operations:
+                if name == 'fill' and shape != 'complete':     # fill always builds a complete tree
+                    continue
+                record = {'operation': name, 'shape': shape, 'nodes': n}
+                record.update(measure(name, shape, n, repeat, min_time))
+                results.append(record)
+                if 'error' in record:
+                    print(f"{shape:>10} {n:>8} {name:>15}  {record['error']}")
+                else:
+                    print(f"{shape:>10} {n:>8} {name:>15} {record['seconds']:10.4f}s "
+                          f"{record['peak_bytes']:>12} B {record['positions']:>9} positions")
+    return results
+
+
+def compare(results, baseline_path, tolerance, noise_floor, recheck, min_time):
+    # Printing the operations that got slower than tolerance times the baseline.
+    # Times are scaled by their reference_workload time, so a machine that is busier
+    # than when the baseline was saved does not look like a regression. Slowdowns of
+    # less than noise_floor seconds are timer noise and not reported, and every
+    # suspected regression is timed again, longer, before it is reported.
+    with open(baseline_path) as input_file:
+        baseline = {(r['operation'], r['shape'], r['nodes']): r for r in json.load(input_file)['results']}
+
+    def ratio(record, old):
+        if not old['seconds']:
+            return 1.0
+        if 'reference_seconds' in old:
+            return (record['seconds'] / record['reference_seconds']) / (old['seconds'] / old['reference_seconds'])
+        return record['seconds'] / old['seconds']
+
+    def slower(record, old):
+        return ratio(record, old) > tolerance and record['seconds'] - old['seconds'] > noise_floor
+
+    regressions = 0
+    for record in results:
+        old = baseline.get((record['operation'], record['shape'], record['nodes']))
+        if old is None or 'seconds' not in old or 'seconds' not in record or not slower(record, old):
+            continue
+        record['seconds'], record['reference_seconds'] = median_time(
+            record['operation'], record['shape'], record['nodes'], recheck, 5 * min_time)
+        if slower(record, old):
+            regressions += 1
+            print(f"REGRESSION {record['shape']} {record['nodes']} {record['operation']}: "
+                  f"{old['seconds']:.4f}s -> {record['seconds']:.4f}s ({ratio(record, old):.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the PA2 tree operations.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6])
+    parser.add_argument('--shapes', nargs='+', default=list(SHAPES), choices=list(SHAPES))
+    parser.add_argument('--operations', nargs='+', default=list(OPERATIONS), choices=list(OPERATIONS))
+    parser.add_argument('--output', default='tree_bench_results.json')
+    parser.add_argument('--save-baseline', metavar='PATH', help='also write the results to PATH')
+    parser.add_argument('--compare', metavar='PATH', help='compare the timings with a saved baseline')
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help='slowdown ratio reported as a regression')
+    parser.add_argument('--noise-floor', type=float, default=0.001,
+                        help='smallest slowdown in seconds reported as a regression')
+    parser.add_argument('--repeat', type=int, default=7, help='least timing runs per operation, the median is kept')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='fast operations are run until this many seconds were measured')
+    parser.add_argument('--recheck', type=int, default=20,
+                        help='least timing runs of an operation that looks slower than the baseline')
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    results = run_benchmarks(args.sizes, args.shapes, args.operations, args.repeat, args.min_time)
+    regressions = args.compare and compare(results, args.compare, args.tolerance, args.noise_floor,
+                                           args.recheck, args.min_time)
+    report = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,11 @@
+from array import array
 from collections import deque
+from functools import reduce
+import multiprocessing
+import mmap
+import os
+import pickle
+import struct
 
 
 class Tree:
@@ -128,6 +135,16 @@ class LinkedBinaryTree(BinaryTree):
             self._left = left
             self._right = right
 
+    class _AugmentedNode(_Node):
+        """Node that also caches its subtree size, subtree height and depth."""
+        __slots__ = '_subtree_size', '_height', '_depth'
+
+        def __init__(self, element, parent=None, left=None, right=None):
+            super().__init__(element, parent, left, right)
+            self._subtree_size = 1
+            self._height = 0
+            self._depth = parent._depth + 1 if parent is not None else 0
+
     class Position(BinaryTree.Position):
         """An abstraction representing the location of a single element."""
 
@@ -144,6 +161,79 @@ class LinkedBinaryTree(BinaryTree):
             """Return True if other is a Position representing the same location."""
             return type(other) is type(self) and other._node is self._node
 
+    class Cursor:
+        """A movable handle on a node for allocation-free navigation.
+
+        Moving the cursor changes it in place instead of creating a Position per
+        step. Each go_* method returns True if the cursor moved, or False (and
+        stays put) when there is no such node.
+        """
+        __slots__ = '_container', '_node'
+
+        def __init__(self, container, node):
+            """Constructor should not be invoked by user, see LinkedBinaryTree.cursor."""
+            self._container = container
+            self._node = node
+
+        @property
+        def element(self):
+            """The element stored at the cursor's node."""
+            return self._node._element
+
+        def has_left(self):
+            """Return True if the node has a left child."""
+            return self._node._left is not None
+
+        def has_right(self):
+            """Return True if the node has a right child."""
+            return self._node._right is not None
+
+        def is_root(self):
+            """Return True if the cursor is at the root."""
+            return self._node._parent is None
+
+        def go_left(self):
+            """Move to the left child."""
+            if self._node._left is None:
+                return False
+            self._node = self._node._left
+            return True
+
+        def go_right(self):
+            """Move to the right child."""
+            if self._node._right is None:
+                return False
+            self._node = self._node._right
+            return True
+
+        def go_parent(self):
+            """Move to the parent."""
+            if self._node._parent is None:
+                return False
+            self._node = self._node._parent
+            return True
+
+        def go_root(self):
+            """Move back to the root of the tree."""
+            self._node = self._container._root
+            return True
+
+        def position(self):
+            """Return a Position for the cursor's current node."""
+            if self._node._parent is self._node:     # convention for deprecated nodes
+                raise ValueError("cursor node is no longer valid")
+            return self._container._make_position(self._node)
+
+    def cursor(self, p=None):
+        """Return a Cursor placed at Position p (the root if p is None).
+
+        Raise ValueError if the tree is empty.
+        """
+        node = self._root if p is None else self._validate(p)
+        if node is None:
+            raise ValueError("Tree is empty")
+        return self.Cursor(self, node)
+
     def _validate(self, p):
         """Return associated node, if the position is valid."""
         if not isinstance(p, self.Position):
@@ -160,10 +250,22 @@ class LinkedBinaryTree(BinaryTree):
 
     # -------------------------- binary tree constructor --------------------------
 
-    def __init__(self):
-        """Create an initially empty binary tree."""
+    def __init__(self, augmented=False, indexed=False):
+        """Create an initially empty binary tree.
+
+        If augmented is True, every node caches its subtree size, height and depth,
+        so height(p), depth(p) and subtree_size(p) are O(1) reads.
+        If indexed is True, a value-to-node index makes find and find_all O(1) expected.
+        An indexed tree only takes hashable elements (or lists of them), others raise
+        TypeError before the tree is changed.
+        """
         self._root = None
         self._size = 0
+        self._augmented = augmented
+        self._value_index = {} if indexed else None   # element key -> {node: None}
+        self._version = 0       # bumped by every structural change, see AncestryIndex
+        if augmented:
+            self._Node = self._AugmentedNode
 
     # -------------------------- public accessors --------------------------
     def __len__(self):
@@ -206,8 +308,12 @@ class LinkedBinaryTree(BinaryTree):
         """
         if self._root is not None:
             raise ValueError("Root exists")
+        self._check_indexable(e)
         self._size = 1
+        self._version += 1
         self._root = self._Node(e)
+        if self._value_index is not None:
+            self._index_add(self._root)
         return self._make_position(self._root)
 
     def _add_left(self, p, e):
@@ -219,8 +325,14 @@ class LinkedBinaryTree(BinaryTree):
         node = self._validate(p)
         if node._left is not None:
             raise ValueError("Left child exists")
+        self._check_indexable(e)
         self._size += 1
+        self._version += 1
         node._left = self._Node(e, node)  # node is its parent
+        if self._augmented:
+            self._refresh(node)
+        if self._value_index is not None:
+            self._index_add(node._left)
         return self._make_position(node._left)
 
     def _add_right(self, p, e):
@@ -232,15 +344,26 @@ class LinkedBinaryTree(BinaryTree):
         node = self._validate(p)
         if node._right is not None:
             raise ValueError("Right child exists")
+        self._check_indexable(e)
         self._size += 1
+        self._version += 1
         node._right = self._Node(e, node)  # node is its parent
+        if self._augmented:
+            self._refresh(node)
+        if self._value_index is not None:
+            self._index_add(node._right)
         return self._make_position(node._right)
 
     def replace(self, p, e):
         """Replace the element at position p with e, and return old element."""
         node = self._validate(p)
+        self._check_indexable(e)
         old = node._element
+        if self._value_index is not None:
+            self._index_remove(node)
         node._element = e
+        if self._value_index is not None:
+            self._index_add(node)
         return old
 
     def _delete(self, p):
@@ -265,6 +388,13 @@ class LinkedBinaryTree(BinaryTree):
             else:
                 parent._right = child
         self._size -= 1
+        self._version += 1
+        if self._augmented:
+            if child is not None:
+                self._recompute(child)  # the child's subtree moved one level up
+            self._refresh(child._parent if child is not None else node._parent)
+        if self._value_index is not None:
+            self._index_remove(node)
         node._parent = node  # convention for deprecated node
         return node._element
 
@@ -275,8 +405,16 @@ class LinkedBinaryTree(BinaryTree):
             raise ValueError("Position must be a leaf")
         if not all(isinstance(tree, type(self)) for tree in (t1, t2)):
             raise TypeError("Tree types must match")
+        if any(tree._augmented != self._augmented for tree in (t1, t2)):
+            raise TypeError("Trees must all be augmented or all be plain")
+        for tree in (t1, t2):
+            if self._value_index is not None and tree._value_index is None:
+                for e in tree.iter_preorder():
+                    self._check_indexable(e)
 
         self._size += len(t1) + len(t2)
+        for tree in (self, t1, t2):
+            tree._version += 1
 
         if not t1.is_empty():
             # Attach t1 as the left subtree of the node
@@ -288,10 +426,168 @@ class LinkedBinaryTree(BinaryTree):
         if not t2.is_empty():
             # Attach t2 as the right subtree of the node
             t2._root._parent = node
-            node._right = t2.root
+            node._right = t2._root
             t2._root = None  # Set t2 instance to empty
             t2._size = 0
 
+        if self._augmented:
+            for child in (node._left, node._right):
+                if child is not None:
+                    self._recompute(child)  # depths of the attached subtrees change
+            self._refresh(node)
+        for tree in (t1, t2):
+            if tree._value_index is not None:
+                tree._value_index = {}      # t1 and t2 are now empty
+        if self._value_index is not None:
+            for child in (node._left, node._right):
+                if child is not None:
+                    self._index_subtree(child)
+
+    # ---------- value index ----------
+    @staticmethod
+    def _index_key(e):
+        """Return the hashable key e is indexed under (lists, as read from files, become tuples)."""
+        return tuple(e) if isinstance(e, list) else e
+
+    def _check_indexable(self, e):
+        """Raise TypeError if this tree is indexed and e has no hashable index key."""
+        if self._value_index is not None:
+            try:
+                hash(self._index_key(e))
+            except TypeError:
+                raise TypeError(f"Indexed trees only take hashable elements, not {type(e).__name__}") from None
+
+    def _index_add(self, node):
+        """Add node to the value index under its element."""
+        self._value_index.setdefault(self._index_key(node._element), {})[node] = None
+
+    def _index_remove(self, node):
+        """Remove node from the value index."""
+        key = self._index_key(node._element)
+        bucket = self._value_index[key]
+        del bucket[node]
+        if not bucket:
+            del self._value_index[key]
+
+    def _index_subtree(self, top):
+        """Add every node of the subtree rooted at node top to the value index."""
+        stack = [top]
+        while stack:
+            node = stack.pop()
+            self._index_add(node)
+            if node._left is not None:
+                stack.append(node._left)
+            if node._right is not None:
+                stack.append(node._right)
+
+    # ---------- parallel aggregation ----------
+    def aggregate(self, fold, combine, initial, workers=None, threshold=100000):
+        """Fold fold(acc, element) over every element and return the result.
+
+        The tree is split into disjoint subtrees near the root. Each subtree's
+        elements are shipped as a flat level-order list to a process pool and
+        folded from initial, and the partial results are merged with combine(a, b).
+        initial must be neutral for combine, and fold and combine must be picklable
+        (module-level functions). Trees smaller than threshold, or a single worker,
+        are folded serially in this process. Element order is not preserved.
+        """
+        workers = workers or os.cpu_count() or 1
+        if self.is_empty() or self._size < threshold or workers < 2:
+            return reduce(fold, self.iter_preorder(), initial)
+        # Expanding the shallowest subtree until there are enough parts.
+        top = []                            # nodes above the parts, folded here
+        parts = deque([self._root])
+        while parts and len(parts) < workers:
+            the_node = parts.popleft()
+            top.append(the_node._element)
+            parts.extend(child for child in (the_node._left, the_node._right) if child is not None)
+        jobs = [(fold, initial, self._subtree_levelorder(the_node)) for the_node in parts]
+        partials = []
+        if jobs:
+            with multiprocessing.Pool(min(workers, len(jobs))) as pool:
+                partials = pool.starmap(_fold_elements, jobs)
+        return reduce(combine, partials, _fold_elements(fold, initial, top))
+
+    def _subtree_levelorder(self, top):
+        """Return the elements of the subtree rooted at node top as a level-order list."""
+        result = []
+        our_queue = deque([top])
+        while our_queue:
+            the_node = our_queue.popleft()
+            result.append(the_node._element)
+            if the_node._left is not None:
+                our_queue.append(the_node._left)
+            if the_node._right is not None:
+                our_queue.append(the_node._right)
+        return result
+
+    def ancestry_index(self):
+        """Return an AncestryIndex of the tree in its current shape."""
+        return AncestryIndex(self)
+
+    def find(self, value):
+        """Return a Position storing value (or None if there is none).
+
+        Expected O(1) on an indexed tree, a preorder search otherwise.
+        """
+        if self._value_index is None:
+            return next((p for p in self.iter_preorder(positions=True) if p.element() == value), None)
+        bucket = self._value_index.get(self._index_key(value))
+        return self._make_position(next(iter(bucket))) if bucket else None
+
+    def find_all(self, value):
+        """Return a list of the Positions storing value."""
+        if self._value_index is None:
+            return [p for p in self.iter_preorder(positions=True) if p.element() == value]
+        return [self._make_position(node) for node in self._value_index.get(self._index_key(value), ())]
+
+    # ---------- augmented mode ----------
+    def _refresh(self, node):
+        """Recompute the cached subtree size and height of node and all its ancestors."""
+        while node is not None:
+            left, right = node._left, node._right
+            node._subtree_size = 1 + (left._subtree_size if left else 0) + (right._subtree_size if right else 0)
+            node._height = 1 + max(left._height if left else -1, right._height if right else -1)
+            node = node._parent
+
+    def _recompute(self, top):
+        """Recompute the cached values of every node in the subtree rooted at node top."""
+        order = []                      # preorder, so parents come before their children
+        stack = [top]
+        top._depth = top._parent._depth + 1 if top._parent is not None else 0
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for child in (node._left, node._right):
+                if child is not None:
+                    child._depth = node._depth + 1
+                    stack.append(child)
+        for node in reversed(order):    # children before their parents
+            left, right = node._left, node._right
+            node._subtree_size = 1 + (left._subtree_size if left else 0) + (right._subtree_size if right else 0)
+            node._height = 1 + max(left._height if left else -1, right._height if right else -1)
+
+    def height(self, p=None):
+        """ Return the height of the subtree rooted at Position p.
+            If p is None, return the height of the entire tree.
+        """
+        if not self._augmented:
+            return super().height(p)
+        # An empty tree has no root Position and fails validation, as in the plain tree.
+        return self._validate(self.root() if p is None else p)._height
+
+    def depth(self, p):
+        """Return the number of levels separating Position p from the root."""
+        if not self._augmented:
+            return super().depth(p)
+        return self._validate(p)._depth
+
+    def subtree_size(self, p):
+        """Return the number of elements in the subtree rooted at Position p."""
+        if self._augmented:
+            return self._validate(p)._subtree_size
+        return sum(1 for _ in self.iter_preorder(p))
+
     def find_child_by_value(self, p, value):
         for i in self.children(p):
             if i._node._element == value:
@@ -304,7 +600,11 @@ class LinkedBinaryTree(BinaryTree):
           Parameters:
           - elements: List of elements to fill the tree with.
           """
+        if self._value_index is not None:
+            for e in elements:
+                self._check_indexable(e)
         our_queue = deque()                 # the empty our_queue
+        self._version += 1
         self._root = self._Node(elements[0])
         self._size += 1                     
         our_queue.append(self._root)        # enqueue operation for our_queue for root
@@ -321,6 +621,48 @@ class LinkedBinaryTree(BinaryTree):
                 self._size += 1
                 our_queue.append(the_node._right)   # enqueue operation
                 pointer_value += 1
+        if self._augmented:
+            self._recompute(self._root)
+        if self._value_index is not None:
+            self._index_subtree(self._root)
+
+    def fill_from_iterable(self, elements):
+        """Fill the empty binary tree in level order from any iterable of elements.
+
+        Nodes are attached as the elements arrive (a generator or an open file works),
+        so besides the tree only the queue of nodes still missing children is kept.
+        Raise ValueError if the tree is nonempty.
+        """
+        if self._root is not None:
+            raise ValueError("Root exists")
+        iterator = iter(elements)
+        self._version += 1
+        for first in iterator:
+            self._check_indexable(first)
+            self._root = self._Node(first)
+            self._size = 1
+            break
+        else:
+            return                          # nothing to fill
+        our_queue = deque([self._root])     # frontier: nodes waiting for children
+        for element in iterator:
+            try:
+                self._check_indexable(element)
+            except TypeError:
+                self._root, self._size = None, 0    # back to the empty tree it was
+                raise
+            the_node = our_queue[0]
+            if the_node._left is None:
+                the_node._left = child = self._Node(element, the_node)
+            else:
+                the_node._right = child = self._Node(element, the_node)
+                our_queue.popleft()         # both children attached
+            self._size += 1
+            our_queue.append(child)
+        if self._augmented:
+            self._recompute(self._root)
+        if self._value_index is not None:
+            self._index_subtree(self._root)
 
     def levelorder(self):
         """Perform a level-order traversal of the tree and return a list of elements."""
@@ -365,10 +707,367 @@ class LinkedBinaryTree(BinaryTree):
             yield from self.postorder(c)
         yield p.element()
 
+    # ---------- iterative traversals ----------
+    # These walk the _Node pointers with an explicit stack: no generator is nested per
+    # level, no Position is built per step and deep (skewed) trees cannot hit the
+    # recursion limit. They yield elements, or Positions when positions is True.
+    def _start_node(self, p):
+        """Return the node to start a traversal from (root if p is None)."""
+        return self._root if p is None else self._validate(p)
+
+    def iter_preorder(self, p=None, positions=False):
+        """Generate a preorder traversal of the subtree rooted at p without recursion."""
+        node = self._start_node(p)
+        stack = [node] if node is not None else []
+        while stack:
+            node = stack.pop()
+            yield self._make_position(node) if positions else node._element
+            if node._right is not None:     # right is pushed first so that left is visited first
+                stack.append(node._right)
+            if node._left is not None:
+                stack.append(node._left)
+
+    def iter_inorder(self, p=None, positions=False):
+        """Generate an inorder traversal of the subtree rooted at p without recursion."""
+        node = self._start_node(p)
+        stack = []
+        while stack or node is not None:
+            while node is not None:         # going down the left spine
+                stack.append(node)
+                node = node._left
+            node = stack.pop()
+            yield self._make_position(node) if positions else node._element
+            node = node._right
+
+    def iter_postorder(self, p=None, positions=False):
+        """Generate a postorder traversal of the subtree rooted at p without recursion."""
+        node = self._start_node(p)
+        stack = []
+        last = None                         # last node yielded
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node._left
+                continue
+            top = stack[-1]
+            if top._right is not None and top._right is not last:
+                node = top._right           # right subtree not visited yet
+            else:
+                last = stack.pop()
+                yield self._make_position(last) if positions else last._element
+
+    # ---------- binary snapshots ----------
+    # Layout: header (magic, node count, shape bytes), then 2 bits per node in level
+    # order telling whether it has a left and a right child, then the pickled list of
+    # elements in the same order. The shape is rebuilt without recursion.
+    _SNAPSHOT_HEADER = struct.Struct('<4sQQ')
+    _SNAPSHOT_MAGIC = b'LBT1'
+
+    def save(self, path):
+        """Write a compact binary snapshot of the tree to path."""
+        shape = bytearray((self._size + 3) // 4)
+        elements = []
+        our_queue = deque([self._root] if self._root is not None else [])
+        index = 0
+        while our_queue:
+            the_node = our_queue.popleft()
+            elements.append(the_node._element)
+            bits = 0
+            if the_node._left is not None:
+                bits |= 2
+                our_queue.append(the_node._left)
+            if the_node._right is not None:
+                bits |= 1
+                our_queue.append(the_node._right)
+            shape[index >> 2] |= bits << (6 - 2 * (index & 3))
+            index += 1
+        with open(path, 'wb') as output_file:
+            output_file.write(self._SNAPSHOT_HEADER.pack(self._SNAPSHOT_MAGIC, len(elements), len(shape)))
+            output_file.write(shape)
+            pickle.dump(elements, output_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path, augmented=False, indexed=False):
+        """Return a new tree rebuilt from a snapshot written by save, in one linear pass.
+
+        The elements are restored with pickle.loads, which can run arbitrary code:
+        only load snapshots from trusted sources. Raise ValueError if the file is not
+        a snapshot, its body cannot be unpickled or its header does not match its
+        contents.
+        """
+        tree = cls(augmented, indexed)
+        header = cls._SNAPSHOT_HEADER
+        with open(path, 'rb') as input_file:
+            with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if len(mapped) < header.size:
+                    raise ValueError("Not a tree snapshot")
+                magic, count, shape_size = header.unpack_from(mapped)
+                if magic != cls._SNAPSHOT_MAGIC:
+                    raise ValueError("Not a tree snapshot")
+                if shape_size != (count + 3) // 4 or header.size + shape_size > len(mapped):
+                    raise ValueError("Corrupted tree snapshot")
+                shape = mapped[header.size:header.size + shape_size]
+                try:
+                    elements = pickle.loads(mapped[header.size + shape_size:])
+                except Exception as error:      # a damaged pickle can fail in many ways
+                    raise ValueError("Corrupted tree snapshot") from error
+        if not isinstance(elements, list) or len(elements) != count:
+            raise ValueError("Corrupted tree snapshot")
+        if count == 0:
+            return tree
+        nodes = [tree._Node(e) for e in elements]
+        following = 1                   # level-order index of the next child to link
+        for index, the_node in enumerate(nodes):
+            bits = shape[index >> 2] >> (6 - 2 * (index & 3))
+            if bits & 2:
+                if following == count:
+                    raise ValueError("Corrupted tree snapshot")
+                the_node._left = nodes[following]
+                nodes[following]._parent = the_node
+                following += 1
+            if bits & 1:
+                if following == count:
+                    raise ValueError("Corrupted tree snapshot")
+                the_node._right = nodes[following]
+                nodes[following]._parent = the_node
+                following += 1
+        if following != count:          # some nodes were never linked to a parent
+            raise ValueError("Corrupted tree snapshot")
+        tree._root = nodes[0]
+        tree._size = count
+        if augmented:
+            tree._recompute(tree._root)
+        if indexed:
+            tree._index_subtree(tree._root)
+        return tree
+
     def read_elements_from_file(self,filename):
         with open(filename, 'r') as input_file:
               return [list(line.strip()) for line in input_file]
 
+    def iter_elements_from_file(self, filename):
+        """Generate the elements of read_elements_from_file one line at a time."""
+        with open(filename, 'r') as input_file:
+            for line in input_file:
+                yield list(line.strip())
+
+def _fold_elements(fold, initial, elements):
+    """Worker of LinkedBinaryTree.aggregate: fold one part's elements from initial."""
+    return reduce(fold, elements, initial)
+
+
+class AncestryIndex:
+    """Precomputed ancestor, LCA and distance queries on a LinkedBinaryTree.
+
+    Built in O(n log n) from a preorder (Euler tour) numbering: entry time, exit
+    time and depth per node, plus a sparse table of depth minima over the preorder.
+    is_ancestor is O(1), lca and distance are O(1) after that. Any structural change
+    of the tree makes the index stale, and queries then raise ValueError.
+    """
+
+    def __init__(self, tree):
+        self._tree = tree
+        self._version = tree._version
+        self._entry = {}                    # node -> preorder index (entry time)
+        self._nodes = []                    # preorder index -> node
+        self._depth = array('i')            # preorder index -> depth
+        stack = [(tree._root, 0)] if tree._root is not None else []
+        while stack:
+            node, depth = stack.pop()
+            self._entry[node] = len(self._nodes)
+            self._nodes.append(node)
+            self._depth.append(depth)
+            if node._right is not None:
+                stack.append((node._right, depth + 1))
+            if node._left is not None:
+                stack.append((node._left, depth + 1))
+        self._exit = array('i', range(len(self._nodes)))     # preorder index -> last index of its subtree
+        for index in range(len(self._nodes) - 1, 0, -1):   # children end after their parents
+            parent = self._entry[self._nodes[index]._parent]
+            self._exit[parent] = max(self._exit[parent], self._exit[index])
+        # _table[k][i] is the preorder index of least depth in [i, i + 2**k).
+        size = len(self._nodes)
+        self._table = [array('i', range(size))]
+        span = 1
+        while 2 * span <= size:
+            below, depth = self._table[-1], self._depth
+            self._table.append(array('i', (
+                below[i] if depth[below[i]] <= depth[below[i + span]] else below[i + span]
+                for i in range(size - 2 * span + 1))))
+            span *= 2
+
+    def _index_of(self, p):
+        """Return the preorder index of Position p, checking the index is up to date."""
+        if self._tree._version != self._version:
+            raise ValueError("AncestryIndex is stale, the tree has changed since it was built")
+        return self._entry[self._tree._validate(p)]
+
+    def _shallowest(self, low, high):
+        """Return the preorder index of least depth in [low, high]."""
+        level = (high - low + 1).bit_length() - 1
+        first, second = self._table[level][low], self._table[level][high - (1 << level) + 1]
+        return first if self._depth[first] <= self._depth[second] else second
+
+    def is_ancestor(self, p, q):
+        """Return True if p is q or an ancestor of q."""
+        i, j = self._index_of(p), self._index_of(q)
+        return i <= j <= self._exit[i]
+
+    def depth(self, p):
+        """Return the depth of Position p."""
+        return self._depth[self._index_of(p)]
+
+    def lca(self, p, q):
+        """Return the Position of the lowest common ancestor of p and q."""
+        i, j = sorted((self._index_of(p), self._index_of(q)))
+        if j <= self._exit[i]:              # p or q is an ancestor of the other
+            return self._tree._make_position(self._nodes[i])
+        # The shallowest node entered after i up to j is a child of the LCA.
+        return self._tree._make_position(self._nodes[self._shallowest(i + 1, j)]._parent)
+
+    def distance(self, p, q):
+        """Return the number of edges on the path between p and q."""
+        ancestor = self.lca(p, q)
+        return self.depth(p) + self.depth(q) - 2 * self.depth(ancestor)
+
+
+class ArrayBinaryTree(BinaryTree):
+    """Array-based representation of a complete binary tree.
+
+    Elements are stored in level order in a single list, so the children of the
+    element at index i are at 2i+1 and 2i+2 and its parent is at (i-1)//2.
+    """
+
+    class Position(BinaryTree.Position):
+        """An abstraction representing the location of a single element."""
+
+        def __init__(self, container, index):
+            """Constructor should not be invoked by user."""
+            self._container = container
+            self._index = index
+
+        def element(self):
+            """Return the element stored at this Position."""
+            return self._container._data[self._index]
+
+        def __eq__(self, other):
+            """Return True if other is a Position representing the same location."""
+            return type(other) is type(self) and other._container is self._container and other._index == self._index
+
+    def _validate(self, p):
+        """Return associated index, if the position is valid."""
+        if not isinstance(p, self.Position):
+            raise TypeError("p must be a proper Position type")
+        if p._container is not self:
+            raise ValueError("p does not belong to this container")
+        if p._index >= len(self._data):  # tree has been refilled with fewer elements
+            raise ValueError("p is no longer valid")
+        return p._index
+
+    def _make_position(self, index):
+        """Return Position instance for the given index (or None if out of the tree)."""
+        return self.Position(self, index) if 0 <= index < len(self._data) else None
+
+    # -------------------------- binary tree constructor --------------------------
+    def __init__(self):
+        """Create an initially empty binary tree."""
+        self._data = []
+
+    # -------------------------- public accessors --------------------------
+    def __len__(self):
+        """Return the total number of elements in the tree."""
+        return len(self._data)
+
+    def root(self):
+        """Return the root Position of the tree (or None if the tree is empty)."""
+        return self._make_position(0)
+
+    def parent(self, p):
+        """Return the Position of p's parent (or None if p is the root)."""
+        index = self._validate(p)
+        return self._make_position((index - 1) // 2) if index > 0 else None
+
+    def left(self, p):
+        """Return the Position of p's left child (or None if no left child)."""
+        return self._make_position(2 * self._validate(p) + 1)
+
+    def right(self, p):
+        """Return the Position of p's right child (or None if no right child)."""
+        return self._make_position(2 * self._validate(p) + 2)
+
+    def num_children(self, p):
+        """Return the number of children of Position p."""
+        first = 2 * self._validate(p) + 1
+        return max(0, min(2, len(self._data) - first))
+
+    def replace(self, p, e):
+        """Replace the element at position p with e, and return old element."""
+        index = self._validate(p)
+        old = self._data[index]
+        self._data[index] = e
+        return old
+
+    def fill(self, elements):
+        """Fill the binary tree with elements in a level-order manner.
+
+          Parameters:
+          - elements: Iterable of elements to fill the tree with.
+          """
+        self._data = list(elements)     # level order is the storage order, a single bulk copy
+
+    def levelorder(self):
+        """Return a list of the elements in level order (or None if the tree is empty)."""
+        if self.is_empty():
+            return None
+        return list(self._data)
+
+    def preorder(self, p=None):
+        """Generate a preorder traversal of the tree rooted at Position p."""
+        if self.is_empty():
+            return
+        data, size = self._data, len(self._data)
+        stack = [0 if p is None else self._validate(p)]
+        while stack:
+            index = stack.pop()
+            yield data[index]
+            if 2 * index + 2 < size:    # right is pushed first so that left is visited first
+                stack.append(2 * index + 2)
+            if 2 * index + 1 < size:
+                stack.append(2 * index + 1)
+
+    def inorder(self, p=None):
+        """Generate an inorder traversal of the tree rooted at Position p."""
+        if self.is_empty():
+            return
+        data, size = self._data, len(self._data)
+        stack = []
+        index = 0 if p is None else self._validate(p)
+        while stack or index < size:
+            while index < size:         # going down the left spine
+                stack.append(index)
+                index = 2 * index + 1
+            index = stack.pop()
+            yield data[index]
+            index = 2 * index + 2
+
+    def postorder(self, p=None):
+        """Generate a postorder traversal of the tree rooted at Position p."""
+        if self.is_empty():
+            return
+        data, size = self._data, len(self._data)
+        stack = [(0 if p is None else self._validate(p), False)]
+        while stack:
+            index, children_done = stack.pop()
+            if children_done:
+                yield data[index]
+            else:
+                stack.append((index, True))
+                if 2 * index + 2 < size:
+                    stack.append((2 * index + 2, False))
+                if 2 * index + 1 < size:
+                    stack.append((2 * index + 1, False))
+
+
 def main():
     tree = LinkedBinaryTree()
     # Fill the tree with elements in a level-order manner
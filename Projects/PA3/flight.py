@@ -1,4 +1,7 @@
+from bisect import bisect_left, bisect_right
 from collections.abc import MutableMapping
+import heapq
+from operator import itemgetter
 from random import randrange
 import csv
 
@@ -19,6 +22,41 @@ class MapBase(MutableMapping):
         def __lt__(self, other):
             return self._key < other._key
 
+    # bulk construction, subclasses provide _load_sorted(pairs)
+    @staticmethod
+    def _last_wins(pairs):
+        """
+        Generate (key, value) pairs sorted by key keeping only the last pair of
+        each run of equal keys. Raise ValueError if pairs are not sorted by key.
+        """
+        previous = None
+        for pair in pairs:
+            if previous is not None:
+                if pair[0] < previous[0]:
+                    raise ValueError('pairs must be sorted by key')
+                if previous[0] < pair[0]:
+                    yield previous
+            previous = pair
+        if previous is not None:
+            yield previous
+
+    def bulk_load(self, pairs):
+        """
+        Replace the contents of the map with the given (key, value) pairs.
+        The pairs are sorted once (O(n log n)) and the map is built in one pass.
+        On duplicate keys the last pair wins, as with repeated assignment.
+        """
+        self._load_sorted(list(self._last_wins(sorted(pairs, key=itemgetter(0)))))
+
+    def merge(self, pairs):
+        """
+        Merge (key, value) pairs already sorted by key into the map in linear time.
+        On duplicate keys the pairs win over existing items, and later pairs over earlier ones.
+        """
+        existing = self.find_range(None, None)
+        # heapq.merge is stable, so for equal keys the existing item comes first
+        self._load_sorted(list(self._last_wins(heapq.merge(existing, pairs, key=itemgetter(0)))))
+
 
 class SortedTableMap(MapBase):
     """
@@ -48,6 +86,12 @@ class SortedTableMap(MapBase):
                 # answer is right of mid
                 return self._find_index(k, mid + 1, high)
 
+    def _load_sorted(self, pairs):
+        """
+        Rebuild the table from a list of (key, value) pairs with sorted, unique keys.
+        """
+        self._table = [self._Item(k, v) for k, v in pairs]
+
     # public behaviors
     def __init__(self):
         """
@@ -177,11 +221,277 @@ class SortedTableMap(MapBase):
             j += 1
 
 
+class ChunkedSortedMap(MapBase):
+    """
+    Sorted map with the SortedTableMap API, stored as a list of sorted chunks.
+    Keys and values live in parallel per-chunk lists and the largest key of each
+    chunk is kept in _maxes, so a lookup is two iterative bisects (O(log n)).
+    An insert or delete only shifts one chunk of at most 2 * _LOAD items, and
+    range scans walk the chunks sequentially.
+    """
+    _LOAD = 512
+
+    # nonpublic behaviors
+    def _locate(self, k):
+        """
+        Return (i, j) of the leftmost item with key greater than or equal to k,
+        where i is the chunk and j the index inside it.
+        Return (len(self._keys), 0) if no such item qualifies.
+        """
+        i = bisect_left(self._maxes, k)
+        if i == len(self._maxes):
+            return i, 0
+        return i, bisect_left(self._keys[i], k)
+
+    # public behaviors
+    def __init__(self):
+        """
+        Create an empty map.
+        """
+        self._keys = []
+        self._values = []
+        self._maxes = []
+        self._len = 0
+
+    def __len__(self):
+        """
+        Return number of items in the map.
+        """
+        return self._len
+
+    def __getitem__(self, k):
+        """
+        Return value associated with key k (raise KeyError if not found).
+        """
+        i, j = self._locate(k)
+        if i == len(self._keys) or self._keys[i][j] != k:
+            raise KeyError('Key Error:' + repr(k))
+        return self._values[i][j]
+
+    def __setitem__(self, k, v):
+        """
+        Assign value v to key k, overwriting existing value if present.
+        """
+        i, j = self._locate(k)
+        if i < len(self._keys) and self._keys[i][j] == k:
+            # reassign value
+            self._values[i][j] = v
+            return
+        if not self._keys:
+            # first item
+            self._keys.append([k])
+            self._values.append([v])
+            self._maxes.append(k)
+        else:
+            if i == len(self._keys):
+                # new maximum goes at the end of the last chunk
+                i = len(self._keys) - 1
+                j = len(self._keys[i])
+                self._maxes[i] = k
+            self._keys[i].insert(j, k)
+            self._values[i].insert(j, v)
+            if len(self._keys[i]) > 2 * self._LOAD:
+                self._split(i)
+        self._len += 1
+
+    def _load_sorted(self, pairs):
+        """
+        Rebuild the chunks from a list of (key, value) pairs with sorted, unique keys.
+        """
+        self._keys = [[k for k, _ in pairs[i:i + self._LOAD]] for i in range(0, len(pairs), self._LOAD)]
+        self._values = [[v for _, v in pairs[i:i + self._LOAD]] for i in range(0, len(pairs), self._LOAD)]
+        self._maxes = [keys[-1] for keys in self._keys]
+        self._len = len(pairs)
+
+    def _split(self, i):
+        """
+        Split chunk i into two halves.
+        """
+        keys, values = self._keys[i], self._values[i]
+        half = len(keys) // 2
+        self._keys[i:i + 1] = [keys[:half], keys[half:]]
+        self._values[i:i + 1] = [values[:half], values[half:]]
+        self._maxes[i:i + 1] = [keys[half - 1], keys[-1]]
+
+    def __delitem__(self, k):
+        """
+        Remove item associated with key k (raise KeyError if not found).
+        """
+        i, j = self._locate(k)
+        if i == len(self._keys) or self._keys[i][j] != k:
+            raise KeyError('Key Error: ' + repr(k))
+        del self._keys[i][j]
+        del self._values[i][j]
+        self._len -= 1
+        if not self._keys[i]:
+            # drop the empty chunk
+            del self._keys[i]
+            del self._values[i]
+            del self._maxes[i]
+        else:
+            self._maxes[i] = self._keys[i][-1]
+
+    def __iter__(self):
+        """
+        Generate keys of the map ordered from minimum to maximum.
+        """
+        for keys in self._keys:
+            yield from keys
+
+    def __reversed__(self):
+        """
+        Generate keys of the map ordered from maximum to minimum.
+        """
+        for keys in reversed(self._keys):
+            yield from reversed(keys)
+
+    def find_min(self):
+        """
+        Return (key, value) pair with minimum key (or None if empty).
+        """
+        if self._len > 0:
+            return (self._keys[0][0], self._values[0][0])
+        else:
+            return None
+
+    def find_max(self):
+        """
+        Return (key, value) pair with maximum key (or None if empty).
+        """
+        if self._len > 0:
+            return (self._keys[-1][-1], self._values[-1][-1])
+        else:
+            return None
+
+    def find_ge(self, k):
+        """
+        Return (key, value) pair with least key greater than or equal to k.
+        """
+        i, j = self._locate(k)
+        if i < len(self._keys):
+            return (self._keys[i][j], self._values[i][j])
+        else:
+            return None
+
+    def find_lt(self, k):
+        """
+        Return (key, value) pair with greatest key strictly less than k.
+        """
+        i, j = self._locate(k)
+        if j > 0:
+            return (self._keys[i][j - 1], self._values[i][j - 1])
+        elif i > 0:
+            # last item of the previous chunk
+            return (self._keys[i - 1][-1], self._values[i - 1][-1])
+        else:
+            return None
+
+    def find_gt(self, k):
+        """
+        Return (key, value) pair with least key strictly greater than k.
+        """
+        i = bisect_right(self._maxes, k)
+        if i == len(self._maxes):
+            return None
+        j = bisect_right(self._keys[i], k)
+        return (self._keys[i][j], self._values[i][j])
+
+    def find_range(self, start, stop):
+        """
+        Iterate all (key, value) pairs such that start <= key < stop.
+        If start is None, iteration begins with minimum key of map.
+        If stop is None, iteration continues through the maximum key of map.
+        """
+        if start is None:
+            i, j = 0, 0
+        else:
+            # find first result
+            i, j = self._locate(start)
+        while i < len(self._keys):
+            keys, values = self._keys[i], self._values[i]
+            while j < len(keys):
+                if stop is not None and not keys[j] < stop:
+                    return
+                yield (keys[j], values[j])
+                j += 1
+            i, j = i + 1, 0
+
+
 from datetime import datetime
 
 from datetime import datetime, timedelta
 
+_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+_MONTH_DAYS = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)      # 29 Feb is accepted
+_MONTH_START = {month: sum(_MONTH_DAYS[:i]) for i, month in enumerate(_MONTHS)}
+
+
+def date_to_ordinal(date):
+    """
+    Converts a date such as '09May' into its day of the year (1 to 366),
+    so that dates compare chronologically.
+    """
+    day, month = date[:-3], date[-3:].capitalize()
+    if month not in _MONTH_START or not day.isdigit() or not 1 <= int(day) <= _MONTH_DAYS[_MONTHS.index(month)]:
+        raise ValueError('Invalid date: ' + repr(date))
+    return _MONTH_START[month] + int(day)
+
+
+def time_to_minutes(time, end=False):
+    """
+    Converts a time such as '9:05' or '14:45' into minutes after midnight (0 to 1439).
+    With end=True, '24:00' is also accepted as 1440, the end of the day.
+    """
+    hours, minutes = map(int, time.split(':'))
+    if not (0 <= hours < 24 and 0 <= minutes < 60) and not (end and (hours, minutes) == (24, 0)):
+        raise ValueError('Invalid time: ' + repr(time))
+    return hours * 60 + minutes
+
+
+# Packed flight keys: origin and destination codes (up to 3 characters from 0-9, A-Z,
+# 16 bits each), day of the year (9 bits) and minute of the day (11 bits) in one int.
+# Integer order is the order of (origin, destination, date, time) with chronological
+# dates and times.
+_CODE_DIGITS = {c: i + 1 for i, c in enumerate('0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ')}   # 0 pads short codes
+
+
+def _encode_code(code):
+    value = 0
+    padded = code.upper().ljust(3, '\0')
+    if len(padded) != 3:
+        raise ValueError('Invalid airport code: ' + repr(code))
+    for c in padded:
+        if c != '\0' and c not in _CODE_DIGITS:
+            raise ValueError('Invalid airport code: ' + repr(code))
+        value = value * 37 + _CODE_DIGITS.get(c, 0)
+    return value
+
+
+_KEY_BITS = 52     # packed keys are below 2 ** _KEY_BITS
+
+
+def pack_flight_key(origin, destination, date_ordinal, departure_minutes):
+    """
+    Packs a flight key from airport codes, day of the year and minutes after midnight.
+    """
+    return (_encode_code(origin) << 36 | _encode_code(destination) << 20 |
+            date_ordinal << 11 | departure_minutes)
+
+
+def encode_flight_key(origin, destination, date, time):
+    """
+    Packs the (origin, destination, date, time) of a flight, given as strings
+    such as ('LAX', 'SFO', '09May', '14:45'), into one sortable int.
+    Raise ValueError if a field cannot be parsed.
+    """
+    return pack_flight_key(origin, destination, date_to_ordinal(date), time_to_minutes(time))
+
+
 class Flight:
+    # No per-instance __dict__: every flight only holds these fields.
+    __slots__ = ('origin', 'destination', 'date', 'time', 'flight_number', 'seats_first', 'seats_coach',
+                 'duration', 'fare', 'date_ordinal', 'departure_minutes')
+
     def __init__(self,origin,destination,date,time,flight_number,seats_first,seats_coach,duration,fare):
         """
           Constructor for the Flight class.
@@ -196,16 +506,21 @@ class Flight:
           - seats_coach: The number of available seats in the coach class section.
           - duration: The duration of the flight in the format 'XhYm' (hours and minutes).
           - fare: The fare for the flight.
+
+          Seats and fare are stored as numbers, and the date and time are also
+          parsed once into date_ordinal (day of the year) and departure_minutes.
           """
         self.origin = origin
         self.destination = destination
         self.date = date
         self.time = time
         self.flight_number = flight_number
-        self.seats_first = seats_first
-        self.seats_coach = seats_coach
+        self.seats_first = int(seats_first)
+        self.seats_coach = int(seats_coach)
         self.duration = self.duration_represent(duration)
-        self.fare = fare
+        self.fare = float(fare)
+        self.date_ordinal = date_to_ordinal(date)
+        self.departure_minutes = time_to_minutes(time)
     
     def duration_represent(self,duration):
         hours, minutes = map(int,duration[:-1].split('h'))
@@ -216,20 +531,13 @@ class Flight:
             Comparison method for sorting flights.
 
             Defines the less-than comparison based on origin, destination, date, and time.
+            Dates and times are compared chronologically using the pre-parsed fields.
 
             Parameters:
             - other: Another Flight object for comparison.
         """
-        if self.origin != other.origin:
-            return self.origin < other.origin
-        if self.destination != other.destination:
-            return self.destination < other.destination
-        if self.date != other.date:
-            return self.date < other.date
-        
-        self_time = tuple(map(int, self.time.split(':')))
-        other_time = tuple(map(int, other.time.split(':')))
-        return self_time < other_time
+        return ((self.origin, self.destination, self.date_ordinal, self.departure_minutes) <
+                (other.origin, other.destination, other.date_ordinal, other.departure_minutes))
 
 
     def check_seat_availability(self, class_type):
@@ -243,9 +551,9 @@ class Flight:
             - The number of available seats for the specified class type, or None if the class type is invalid.
             """
         if class_type == 'first':
-            return int(self.seats_first)
+            return self.seats_first
         elif class_type == 'coach':
-            return int(self.seats_coach)
+            return self.seats_coach
         else:
             return None
     
@@ -260,11 +568,11 @@ class Flight:
         Returns:
         - True if booking is successful, False otherwise.
         """
-        if class_type == 'first' and int(self.seats_first) > 0:
-            self.seats_first = str(int(self.seats_first) - 1)
+        if class_type == 'first' and self.seats_first > 0:
+            self.seats_first -= 1
             return True
-        elif class_type == 'coach' and int(self.seats_coach) > 0:
-            self.seats_coach = str(int(self.seats_coach) - 1)
+        elif class_type == 'coach' and self.seats_coach > 0:
+            self.seats_coach -= 1
             return True
         else:
             return False
@@ -280,10 +588,10 @@ class Flight:
         - True if booking is successful, False otherwise.
         """
         if class_type == 'first':
-            self.seats_first = str(int(self.seats_first) + 1)
+            self.seats_first += 1
             return True
         elif class_type == 'coach':
-            self.seats_coach = str(int(self.seats_coach) + 1)
+            self.seats_coach += 1
             return True
         else: 
             return False
@@ -299,13 +607,64 @@ class Flight:
 
 
 class FlightDatabase:
-    def __init__(self):
+    def __init__(self, map_type=SortedTableMap):
         """
           Constructor for the FlightDatabase class.
 
-          Creates a SortedTableMap to store flights.
+          Parameters:
+          - map_type: The sorted map class to store flights in, SortedTableMap
+            or ChunkedSortedMap (O(log n) inserts and deletes for large schedules).
+
+          Besides the flights map, secondary indexes map a flight number, an
+          (origin, date) or a (destination, date) to a sorted list of postings
+          and a parallel list of the posted flights, so a query yields its k
+          flights without looking them up again. A posting is the flight key
+          with its departure time (and, for flight numbers, the date) packed
+          above it, so postings sort chronologically.
           """
-        self._flights = SortedTableMap()
+        self._flights = map_type()
+        self._by_number = {}
+        self._by_origin_date = {}
+        self._by_destination_date = {}
+
+    def _postings(self, key, flight):
+        """
+        Returns the (index, index key, posting) triples of a flight.
+        """
+        departure = flight.departure_minutes << _KEY_BITS | key
+        return ((self._by_number, flight.flight_number, flight.date_ordinal << (11 + _KEY_BITS) | departure),
+                (self._by_origin_date, (_encode_code(flight.origin), flight.date_ordinal), departure),
+                (self._by_destination_date, (_encode_code(flight.destination), flight.date_ordinal), departure))
+
+    def _index(self, key, flight):
+        """
+        Adds a stored flight to the secondary indexes.
+        """
+        for index, index_key, posting in self._postings(key, flight):
+            postings, flights = index.setdefault(index_key, ([], []))
+            i = bisect_right(postings, posting)
+            postings.insert(i, posting)
+            flights.insert(i, flight)
+
+    def _unindex(self, key, flight):
+        """
+        Removes a stored flight from the secondary indexes.
+        """
+        for index, index_key, posting in self._postings(key, flight):
+            postings, flights = index[index_key]
+            i = bisect_left(postings, posting)
+            del postings[i]
+            del flights[i]
+            if not postings:
+                del index[index_key]
+
+    @staticmethod
+    def _flights_of(index, index_key):
+        """
+        Returns the flights posted under an index key, in posting order.
+        """
+        entry = index.get(index_key)
+        return entry[1] if entry is not None else ()
 
     def add_flight(self, flight):
         """
@@ -314,8 +673,83 @@ class FlightDatabase:
         Parameters:
         - flight: A Flight object to be added to the database.
         """
-        parameters = (flight.origin, flight.destination, flight.date, flight.time)
-        self._flights[parameters] = flight
+        key = self._flight_key(flight)
+        old = self._flights.get(key)
+        if old is not None:
+            self._unindex(key, old)
+        self._flights[key] = flight
+        self._index(key, flight)
+
+    def remove_flight(self, origin, destination, date, time):
+        """
+        Removes a flight from the database.
+
+        Parameters:
+        - origin: The origin airport code.
+        - destination: The destination airport code.
+        - date: The date of the flight.
+        - time: The departure time of the flight.
+
+        Returns:
+        - The removed Flight object, or None if the flight is not found.
+        """
+        flight = self._find(origin, destination, date, time)
+        if flight is None:
+            return None
+        key = self._flight_key(flight)
+        self._unindex(key, flight)
+        del self._flights[key]
+        return flight
+
+    def add_flights(self, flights):
+        """
+        Adds many flights to the database at once.
+
+        A large batch is sorted once by key and merged into the stored flights in
+        linear time, instead of one binary search and list insert per flight. A
+        batch of m flights with m * log2(n) < n is cheaper to add one by one, as
+        the merge always rebuilds all n stored flights. On duplicate keys the
+        later flight wins, as with add_flight.
+
+        Parameters:
+        - flights: An iterable of Flight objects, such as a nightly schedule delta.
+        """
+        pairs = [(self._flight_key(flight), flight) for flight in flights]
+        stored = len(self._flights)
+        if len(pairs) * stored.bit_length() < stored:
+            for key, flight in pairs:
+                old = self._flights.get(key)
+                if old is not None:
+                    self._unindex(key, old)
+                self._flights[key] = flight
+                self._index(key, flight)
+            return
+        pairs.sort(key=itemgetter(0))
+        winners = dict(pairs)   # last flight of each key
+        for key in winners:
+            old = self._flights.get(key)
+            if old is not None:
+                self._unindex(key, old)
+        self._flights.merge(pairs)
+        for key, flight in winners.items():
+            self._index(key, flight)
+
+    @staticmethod
+    def _flight_key(flight):
+        """
+        Returns the key a flight is stored under in the database (see pack_flight_key).
+        """
+        return pack_flight_key(flight.origin, flight.destination, flight.date_ordinal, flight.departure_minutes)
+
+    def _find(self, origin, destination, date, time):
+        """
+        Returns the flight stored under the given fields, or None if there is none.
+        """
+        try:
+            return self._flights.get(encode_flight_key(origin, destination, date, time))
+        except ValueError:
+            # fields that cannot be parsed match no flight
+            return None
 
     def find_flights(self, origin, destination, date, time_start, time_end):
         """
@@ -326,16 +760,67 @@ class FlightDatabase:
         - destination: The destination airport code.
         - date: The date of the flights.
         - time_start: The start time of the range.
-        - time_end: The end time of the range.
+        - time_end: The end time of the range (exclusive), '24:00' for the end of the day.
 
         Yields:
-        - Flight objects within the specified time range.
-        """
-        for flight in self._flights.find_range(
-            (origin, destination, date, time_start),
-            (origin,destination, date, time_end)):
+        - Flight objects within the specified time range, in departure order.
+          Nothing is yielded if a field cannot be parsed.
+        """
+        try:
+            date_ordinal = date_to_ordinal(date)
+            start = pack_flight_key(origin, destination, date_ordinal, time_to_minutes(time_start))
+            stop = pack_flight_key(origin, destination, date_ordinal, time_to_minutes(time_end, end=True))
+        except ValueError:
+            return
+        for _, flight in self._flights.find_range(start, stop):
             yield flight
 
+    def find_by_flight_number(self, flight_number):
+        """
+        Finds every flight with a given flight number.
+
+        Parameters:
+        - flight_number: The flight number, such as 'UA789'.
+
+        Yields:
+        - Flight objects with that flight number, by date and departure time.
+        """
+        yield from self._flights_of(self._by_number, flight_number)
+
+    def departures(self, origin, date):
+        """
+        Finds every flight leaving an airport on a date.
+
+        Parameters:
+        - origin: The origin airport code.
+        - date: The date of the flights.
+
+        Yields:
+        - Flight objects leaving origin on date, by departure time.
+        """
+        try:
+            index_key = (_encode_code(origin), date_to_ordinal(date))
+        except ValueError:
+            return
+        yield from self._flights_of(self._by_origin_date, index_key)
+
+    def arrivals(self, destination, date):
+        """
+        Finds every flight to an airport departing on a date.
+
+        Parameters:
+        - destination: The destination airport code.
+        - date: The date of the flights.
+
+        Yields:
+        - Flight objects flying to destination on date, by departure time.
+        """
+        try:
+            index_key = (_encode_code(destination), date_to_ordinal(date))
+        except ValueError:
+            return
+        yield from self._flights_of(self._by_destination_date, index_key)
+
     def display_all_flights(self):
         """
              Displays all flights in the database.
@@ -344,15 +829,19 @@ class FlightDatabase:
         for flight in self._flights.values():
             print(flight.origin, flight.destination, flight.date, flight.time)
 
-    def read_flights_from_file(self, filename):
+    def read_flights_from_file(self, filename, bulk=False):
         """
         Reads flights from a CSV file and adds them to the database.
 
         Parameters:
         - filename: The name of the CSV file containing flight information.
+        - bulk: If True, all rows are parsed first and added with add_flights.
         """
         with open(filename, 'r') as input_file:
             data = csv.reader(input_file)
+            if bulk:
+                self.add_flights(Flight(*row) for row in data)
+                return
             for row in data:
                 flight = Flight(*row)
                 self.add_flight(flight)
@@ -371,9 +860,9 @@ class FlightDatabase:
          Returns:
          - The number of available seats for the specified class type, or None if the flight is not found.
          """
-        parameters = (origin, destination, date, time)
-        if parameters in self._flights:
-            return self._flights[parameters].check_seat_availability(class_type)
+        flight = self._find(origin, destination, date, time)
+        if flight is not None:
+            return flight.check_seat_availability(class_type)
         else: 
             return None
 
@@ -391,9 +880,9 @@ class FlightDatabase:
          Returns:
          - True if booking is successful, False otherwise.
          """
-        parameters = (origin, destination, date, time)
-        if parameters in self._flights:
-            return self._flights[parameters].book_seat(class_type)
+        flight = self._find(origin, destination, date, time)
+        if flight is not None:
+            return flight.book_seat(class_type)
         else:
             return False
         
@@ -411,9 +900,9 @@ class FlightDatabase:
         Returns:
         - True if cancellation is successful, False otherwise.
         """
-        parameters = (origin, destination, date, time)
-        if parameters in self._flights:
-            return self._flights[parameters].cancel_booking(class_type)
+        flight = self._find(origin, destination, date, time)
+        if flight is not None:
+            return flight.cancel_booking(class_type)
         else:
             return False
 
@@ -430,9 +919,9 @@ class FlightDatabase:
            Returns:
            - A timedelta object representing the flight duration, or None if the flight is not found.
            """
-        parameters = (origin, destination, date, time)
-        if parameters in self._flights:
-            return self._flights[parameters].calculate_flight_duration()
+        flight = self._find(origin, destination, date, time)
+        if flight is not None:
+            return flight.calculate_flight_duration()
         else:
             return None
         
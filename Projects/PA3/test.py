@@ -1,4 +1,6 @@
-from flight import  FlightDatabase
+import random
+
+from flight import ChunkedSortedMap, Flight, FlightDatabase, SortedTableMap, encode_flight_key
 
 # Example usage
 flight_db = FlightDatabase()
@@ -30,3 +32,97 @@ else:
 print("\nCalculating flight duration for UA789 on 09May at 14:45:")
 duration = flight_db.calculate_flight_duration('LAX', 'SFO', '09May', '14:45')
 print(f"Flight duration: {duration}")
+
+
+# Seeded parity checks of the chunked map and of the secondary indexes.
+
+
+def check_map_parity(seed, operations=3000):
+    # ChunkedSortedMap has to agree with SortedTableMap. A tiny _LOAD makes chunks
+    # split and drop all the time, so lookups keep crossing chunk edges.
+    rng = random.Random(seed)
+    chunked, table = ChunkedSortedMap(), SortedTableMap()
+    chunked._LOAD = 4
+    for _ in range(operations):
+        k = rng.randrange(300)
+        choice = rng.random()
+        if choice < 0.45:
+            chunked[k] = table[k] = rng.random()
+        elif choice < 0.8:
+            if k in table:
+                del chunked[k], table[k]
+            else:
+                for a_map in (chunked, table):
+                    try:
+                        del a_map[k]
+                        raise AssertionError('deleted a missing key')
+                    except KeyError:
+                        pass
+        elif choice < 0.97:
+            for query in ('find_ge', 'find_lt', 'find_gt'):
+                assert getattr(chunked, query)(k) == getattr(table, query)(k), (seed, query, k)
+            start = rng.choice([None, k])
+            stop = rng.choice([None, k + rng.randrange(60)])
+            assert list(chunked.find_range(start, stop)) == list(table.find_range(start, stop)), (seed, start, stop)
+        else:
+            pairs = sorted(((rng.randrange(300), rng.random()) for _ in range(rng.randrange(40))), key=lambda pair: pair[0])
+            chunked.merge(pairs)
+            table.merge(pairs)
+        assert len(chunked) == len(table)
+    assert list(chunked.items()) == list(table.items()), seed
+    assert list(reversed(chunked)) == list(reversed(table)), seed
+    assert (chunked.find_min(), chunked.find_max()) == (table.find_min(), table.find_max()), seed
+
+
+def check_index_parity(seed, map_type, operations=600):
+    # The secondary indexes have to list exactly the stored flights, in posting order,
+    # through add_flight (new and replacing), add_flights (both paths) and remove_flight.
+    rng = random.Random(seed)
+    codes, dates, numbers = ('LAX', 'SFO', 'JFK', 'ORD'), ('05May', '06May', '07May'), ('AA1', 'UA2', 'DL3')
+
+    def random_flight():
+        time = f'{rng.randrange(24):02d}:{rng.choice((0, 15, 30, 45)):02d}'
+        origin, destination = rng.sample(codes, 2)
+        return Flight(origin, destination, rng.choice(dates), time, rng.choice(numbers), '10', '100', '2h30m', '200.0')
+
+    def key_of(flight):
+        return encode_flight_key(flight.origin, flight.destination, flight.date, flight.time)
+
+    database, stored = FlightDatabase(map_type), {}
+    for _ in range(operations):
+        choice = rng.random()
+        if choice < 0.5:
+            flight = random_flight()
+            database.add_flight(flight)
+            stored[key_of(flight)] = flight
+        elif choice < 0.8 and stored:
+            flight = stored.pop(rng.choice(list(stored)))
+            assert database.remove_flight(flight.origin, flight.destination, flight.date, flight.time) is flight
+        else:
+            batch = [random_flight() for _ in range(rng.choice((2, 40)))]
+            database.add_flights(batch)
+            stored.update((key_of(flight), flight) for flight in batch)
+    for number in numbers:
+        expected = sorted((flight for flight in stored.values() if flight.flight_number == number),
+                          key=lambda flight: (flight.date_ordinal, flight.departure_minutes, key_of(flight)))
+        assert list(database.find_by_flight_number(number)) == expected, (seed, number)
+    for code in codes:
+        for date in dates:
+            for query, field in ((database.departures, 'origin'), (database.arrivals, 'destination')):
+                expected = sorted((flight for flight in stored.values()
+                                   if getattr(flight, field) == code and flight.date == date),
+                                  key=lambda flight: (flight.departure_minutes, key_of(flight)))
+                assert list(query(code, date)) == expected, (seed, field, code, date)
+    origin, destination = rng.sample(codes, 2)
+    date = rng.choice(dates)
+    expected = sorted((flight for flight in stored.values()
+                       if (flight.origin, flight.destination, flight.date) == (origin, destination, date)),
+                      key=lambda flight: flight.departure_minutes)
+    assert list(database.find_flights(origin, destination, date, '00:00', '24:00')) == expected, seed
+
+
+for seed in range(10):
+    check_map_parity(seed)
+    for map_type in (SortedTableMap, ChunkedSortedMap):
+        check_index_parity(seed, map_type)
+print("\nChunkedSortedMap and secondary index parity checked on 10 seeds")